@@ -1,12 +1,21 @@
 """
 Poker Agents Package - Specialized AG2 agents for poker strategy and analysis.
+
+Agents are imported lazily on first access so importing one agent doesn't pull
+in every agent's dependencies.
 """
 
-from .base_agent import BasePokerAgent
-from .rules_agent import RulesAgent
-from .position_agent import PositionAgent
-from .math_agent import MathAgent
-from .jonathan_agent import JonathanAgent
+import importlib
+
+_LAZY = {
+    "BasePokerAgent": ".base_agent",
+    "RulesAgent": ".rules_agent",
+    "PositionAgent": ".position_agent",
+    "MathAgent": ".math_agent",
+    "JonathanAgent": ".jonathan_agent",
+    "serialize": ".base_agent",
+    "TokenConsole": ".base_agent",
+}
 
 __all__ = [
     "BasePokerAgent",
@@ -14,4 +23,18 @@ __all__ = [
     "PositionAgent",
     "MathAgent",
     "JonathanAgent",
+    "serialize",
+    "TokenConsole",
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,49 @@
+"""
+Numeric kernels for MathAgent.
+Pure scalar float math compiled with Numba when it is installed, so the same
+functions can sit inside Monte Carlo loops and bet-size sweeps.
+"""
+
+import math
+
+try:
+    from numba import njit  # type: ignore
+except ImportError:  # Numba is optional - kernels run as plain Python
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def pot_odds_kernel(pot_size: float, bet_to_call: float):
+    """Return (pot odds percentage, odds ratio X for 'X:1'; NaN if no bet)"""
+    pot_odds_ratio = bet_to_call / (pot_size + bet_to_call)
+    if pot_odds_ratio == 0.0:
+        return 0.0, math.nan
+    return pot_odds_ratio * 100.0, (1.0 / pot_odds_ratio) - 1.0
+
+
+@njit(cache=True)
+def implied_odds_kernel(
+    pot_size: float, bet_to_call: float, implied_winnings: float
+) -> float:
+    """Return implied odds percentage including future winnings"""
+    return bet_to_call / (pot_size + implied_winnings) * 100.0
+
+
+@njit(cache=True)
+def breakeven_kernel(pot_size: float, bet_size: float) -> float:
+    """Return breakeven percentage for a bet"""
+    return bet_size / (pot_size + bet_size) * 100.0
+
+
+@njit(cache=True)
+def betting_ev_kernel(
+    equity_pct: float, pot_size: float, bet_to_call: float, fold_equity: float
+):
+    """Return (EV of calling, EV of raising) facing a bet"""
+    ev_call = (equity_pct / 100.0 * (pot_size + bet_to_call)) - bet_to_call
+    ev_raise = (fold_equity * pot_size) + ((1.0 - fold_equity) * ev_call)
+    return ev_call, ev_raise
@@ -3,11 +3,75 @@ Base poker agent with common functionality for all specialized agents.
 """
 
 from autogen import ConversableAgent  # type: ignore
-from typing import Dict, Any
+from autogen.events.client_events import StreamEvent  # type: ignore
+from autogen.io import IOConsole  # type: ignore
+from game.hand_history import HandHistory
+from typing import Dict, Any, List, Mapping
+import asyncio
+import io
+import json
+import sys
 import logging
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Static part of every agent's system message, shared across instances
+_SYSTEM_FOOTER = sys.intern("""
+When responding:
+1. Stay focused on your area of expertise
+2. Provide specific, actionable advice
+3. Reference concrete examples when possible
+4. Be concise but thorough
+5. If asked for a recommendation, provide a clear decision with reasoning
+
+Your responses should be professional and focused on helping the human make better poker decisions.
+""")
+
+# Situation fields rendered by format_poker_context, in display order
+_CONTEXT_FIELDS = (
+    ("position", "Position"),
+    ("hole_cards", "Hole Cards"),
+    ("board", "Board"),
+    ("pot_size", "Pot Size"),
+    ("stack_size", "Stack Size"),
+    ("opponents", "Opponents"),
+    ("action_history", "Action"),
+    ("bet_to_call", "Bet to Call"),
+)
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode NumPy values and read-only mappings found in agent payloads"""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def serialize(obj: Any) -> bytes:
+    """Serialize an agent payload (recommendation, analysis) to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(obj, default=_json_default).encode("utf-8")
+
+
+class TokenConsole(IOConsole):
+    """Console output that prints streamed LLM tokens inline as they arrive"""
+
+    def send(self, message: Any) -> None:
+        if isinstance(message, StreamEvent):
+            print(message.content.content, end="", flush=True)
+        else:
+            super().send(message)
+
 
 class BasePokerAgent(ConversableAgent):
     """Base class for all poker agents with common functionality"""
@@ -21,21 +85,11 @@ class BasePokerAgent(ConversableAgent):
         **kwargs,
     ):
         # Enhanced system message with poker context
-        enhanced_system_message = f"""
-{system_message}
-
-IMPORTANT: You are part of a team of poker experts analyzing hands and providing strategic advice.
-Your specialty is: {specialty}
-
-When responding:
-1. Stay focused on your area of expertise
-2. Provide specific, actionable advice
-3. Reference concrete examples when possible
-4. Be concise but thorough
-5. If asked for a recommendation, provide a clear decision with reasoning
-
-Your responses should be professional and focused on helping the human make better poker decisions.
-"""
+        enhanced_system_message = (
+            f"\n{system_message}\n\n"
+            "IMPORTANT: You are part of a team of poker experts analyzing hands and providing strategic advice.\n"
+            f"Your specialty is: {specialty}\n" + _SYSTEM_FOOTER
+        )
 
         super().__init__(
             name=name,
@@ -63,49 +117,61 @@ Your responses should be professional and focused on helping the human make bett
             "reasoning": "Base agent - should be overridden",
         }
 
-    def format_poker_context(self, situation: Dict[str, Any]) -> str:
-        """Format poker situation for the agent"""
-        context_parts = []
-
-        if "position" in situation:
-            context_parts.append(f"Position: {situation['position']}")
-
-        if "hole_cards" in situation:
-            context_parts.append(f"Hole Cards: {situation['hole_cards']}")
-
-        if "board" in situation:
-            context_parts.append(f"Board: {situation['board']}")
+    async def aget_recommendation(self, situation: Dict[str, Any]) -> Dict[str, Any]:
+        """Get a recommendation without blocking the event loop"""
+        return await asyncio.to_thread(self.get_recommendation, situation)
 
-        if "pot_size" in situation:
-            context_parts.append(f"Pot Size: {situation['pot_size']}")
+    def get_recommendation_batch(
+        self, situations: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Get recommendations for several situations"""
+        # Agents with shared lookups (e.g. knowledge base) override this
+        return [self.get_recommendation(situation) for situation in situations]
 
-        if "stack_size" in situation:
-            context_parts.append(f"Stack Size: {situation['stack_size']}")
-
-        if "opponents" in situation:
-            context_parts.append(f"Opponents: {situation['opponents']}")
-
-        if "action_history" in situation:
-            context_parts.append(f"Action: {situation['action_history']}")
+    def format_poker_context(self, situation: Dict[str, Any]) -> str:
+        """Format poker situation for the agent"""
+        buf = io.StringIO()
 
-        if "bet_to_call" in situation:
-            context_parts.append(f"Bet to Call: {situation['bet_to_call']}")
+        for key, label in _CONTEXT_FIELDS:
+            if key in situation:
+                buf.write(f"{label}: {situation[key]}\n")
 
         # Add hand progression history if available
-        if "hand_history" in situation and situation["hand_history"]:
-            context_parts.append("\nHAND PROGRESSION HISTORY:")
-            history = situation["hand_history"]
-            for i, state in enumerate(history[:-1], 1):  # Exclude current state
-                street = state.get('street', 'unknown').upper()
-                action = state.get('action', 'No action recorded')
-                pot = state.get('pot_size', 0)
-                bet = state.get('bet_to_call', 0)
-                board = state.get('board', '')
-                
-                context_parts.append(f"{i}. {street}: {action}")
+        history = situation.get("hand_history")
+        if history:
+            buf.write("\nHAND PROGRESSION HISTORY:\n")
+            if isinstance(history, HandHistory):
+                previous = slice(0, len(history) - 1)  # Exclude current state
+                states = zip(
+                    history.streets[previous],
+                    history.actions[previous],
+                    history.pots[previous],
+                    history.bets[previous],
+                    history.boards[previous],
+                )
+            else:
+                states = (
+                    (
+                        state.get("street", "unknown"),
+                        state.get("action", "No action recorded"),
+                        state.get("pot_size", 0),
+                        state.get("bet_to_call", 0),
+                        state.get("board", ""),
+                    )
+                    for state in history[:-1]  # Exclude current state
+                )
+
+            for i, (street, action, pot, bet, board) in enumerate(states, 1):
                 if board:
-                    context_parts.append(f"   Board: {board} | Pot: ${pot:.1f} | Bet: ${bet:.1f}")
+                    buf.write(
+                        f"{i}. {street.upper()}: {action}\n"
+                        f"   Board: {board} | Pot: ${pot:.1f} | Bet: ${bet:.1f}\n"
+                    )
                 else:
-                    context_parts.append(f"   Pot: ${pot:.1f} | Bet: ${bet:.1f}")
+                    buf.write(
+                        f"{i}. {street.upper()}: {action}\n"
+                        f"   Pot: ${pot:.1f} | Bet: ${bet:.1f}\n"
+                    )
 
-        return "\n".join(context_parts)
+        # Drop the trailing newline so the result matches a "\n".join of lines
+        return buf.getvalue()[:-1]
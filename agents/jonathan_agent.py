@@ -2,17 +2,54 @@
 Jonathan Little Strategy Agent - RAG-enabled agent with access to WPH knowledge base.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Mapping, Optional
 from .base_agent import BasePokerAgent
+from knowledge.semantic_cache import SemanticCache
+from collections import OrderedDict
+from types import MappingProxyType
+import asyncio
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Position and opponent-read lookup tables for apply_jonathan_framework
+_LATE_POS = frozenset({"btn", "button", "co", "cutoff"})
+_EARLY_POS = frozenset({"utg", "ep"})
+_BLIND_POS = frozenset({"bb", "sb"})
+_LOOSE_TAGS = frozenset({"aggressive", "loose"})
+_TIGHT_TAGS = frozenset({"tight", "passive"})
+
+# Single-pass matchers for action history and opponent-read keywords
+_ACTION_RE = re.compile(r"raise|call", re.IGNORECASE)
+_TAG_RE = re.compile(r"aggressive|loose|tight|passive", re.IGNORECASE)
+
+# Framework analysis used when the situation gives nothing more specific
+_FRAMEWORK_DEFAULTS: Mapping[str, str] = MappingProxyType(
+    {
+        "range_analysis": "Analyzing hand ranges based on position and action",
+        "bet_sizing": "Optimal bet sizing for value and bluffs",
+        "opponent_tendencies": "Reading opponent patterns and adjustments",
+        "gto_vs_exploitative": "Balancing theoretical optimal play with exploitative adjustments",
+    }
+)
+
+# Hand classes for the recommendation branches
+_PREMIUM = frozenset({"AA", "KK", "QQ", "AK"})
+_STRONG_EP = frozenset({"AA", "KK", "QQ", "JJ", "AK"})
+
 
 class JonathanAgent(BasePokerAgent):
     """Agent with access to Jonathan Little's strategies from Weekly Poker Hand episodes"""
 
-    def __init__(self, llm_config: Dict[str, Any], knowledge_base=None):
+    def __init__(
+        self,
+        llm_config: Dict[str, Any],
+        knowledge_base=None,
+        semantic_cache_threshold: float = 0.15,
+        semantic_cache_size: int = 512,
+        exact_cache_size: int = 256,
+    ):
         system_message = """
 You are the Jonathan Little Strategy Expert, with access to analysis from 100+ Weekly Poker Hand episodes.
 
@@ -52,6 +89,73 @@ Always provide context from the knowledge base when available, and explain how t
         self.knowledge_base = knowledge_base
         self.confidence_level = 0.8
 
+        # Exact-match query cache (L1) sits in front of the semantic cache (L2)
+        # and the vector DB (L3)
+        self._l1: "OrderedDict[str, str]" = OrderedDict()
+        self._l1_size = exact_cache_size
+
+        # Semantic cache reuses the knowledge base's embedding model so
+        # near-duplicate situations skip the vector DB lookup
+        embedding_function = getattr(knowledge_base, "embedding_function", None)
+        self._sem_cache = (
+            SemanticCache(
+                embedding_function,
+                threshold=semantic_cache_threshold,
+                max_entries=semantic_cache_size,
+            )
+            if embedding_function
+            else None
+        )
+
+    def _build_search_query(self, situation: Dict[str, Any]) -> str:
+        """Build a knowledge base search query from a situation"""
+        hole_cards = situation.get("hole_cards")
+        position = situation.get("position")
+        board = situation.get("board")
+        actions = {
+            match.lower()
+            for match in _ACTION_RE.findall(situation.get("action_history") or "")
+        }
+
+        # Fixed-shape query: empty slots are skipped in the join
+        query_parts = (
+            hole_cards,
+            f"position {position}" if position else None,
+            f"board {board}" if board else None,
+            "facing raise"
+            if "raise" in actions
+            else "multiway pot"
+            if "call" in actions
+            else None,
+            # General strategic terms
+            "strategy decision analysis",
+        )
+
+        return " ".join(filter(None, query_parts))
+
+    def _context_request(self, situation: Dict[str, Any], query: str) -> Dict[str, Any]:
+        """Keyword arguments for a knowledge base context lookup"""
+        return {
+            "situation": query,
+            "position": situation.get("position", ""),
+            "stacks": situation.get("stack_size", ""),
+            "pot_odds": str(situation.get("pot_size", "")),
+        }
+
+    def _l1_get(self, query: str) -> Optional[str]:
+        """Look up an exact query in the L1 cache"""
+        context = self._l1.get(query)
+        if context is not None:
+            self._l1.move_to_end(query)
+        return context
+
+    def _l1_put(self, query: str, context: str):
+        """Store a query's context in the L1 cache, evicting the LRU entry"""
+        self._l1[query] = context
+        self._l1.move_to_end(query)
+        if len(self._l1) > self._l1_size:
+            self._l1.popitem(last=False)
+
     def search_relevant_strategies(self, situation: Dict[str, Any]) -> str:
         """Search the knowledge base for relevant strategies"""
         if not self.knowledge_base:
@@ -59,68 +163,110 @@ Always provide context from the knowledge base when available, and explain how t
 
         try:
             # Build search query from situation
-            query_parts = []
+            query = self._build_search_query(situation)
+
+            # Identical queries skip embedding entirely
+            cached = self._l1_get(query)
+            if cached is not None:
+                return cached
+
+            # Check semantic cache before hitting the vector DB
+            embedding = None
+            if self._sem_cache:
+                embedding = self._sem_cache.embed(query)
+                cached = self._sem_cache.lookup(embedding)
+                if cached is not None:
+                    self._l1_put(query, cached)
+                    return cached
 
-            if situation.get("hole_cards"):
-                query_parts.append(situation["hole_cards"])
+            # Get context from knowledge base
+            context = self.knowledge_base.get_context_for_situation(
+                **self._context_request(situation, query)
+            )
 
-            if situation.get("position"):
-                query_parts.append(f"position {situation['position']}")
+            self._l1_put(query, context)
+            if embedding is not None:
+                self._sem_cache.store(embedding, query, context)
 
-            if situation.get("board"):
-                query_parts.append(f"board {situation['board']}")
+            return context
 
-            if situation.get("action_history"):
-                if "raise" in situation["action_history"].lower():
-                    query_parts.append("facing raise")
-                elif "call" in situation["action_history"].lower():
-                    query_parts.append("multiway pot")
+        except Exception as e:
+            logger.error(f"Error searching knowledge base: {e}")
+            return "Error accessing strategic knowledge"
 
-            # Add general strategic terms
-            query_parts.extend(["strategy", "decision", "analysis"])
+    async def asearch_relevant_strategies(self, situation: Dict[str, Any]) -> str:
+        """Search the knowledge base without blocking the event loop"""
+        return await asyncio.to_thread(self.search_relevant_strategies, situation)
 
-            query = " ".join(query_parts)
+    def search_relevant_strategies_batch(
+        self, situations: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Search the knowledge base for several situations in one lookup"""
+        if not self.knowledge_base:
+            return ["Knowledge base not available"] * len(situations)
 
-            # Get context from knowledge base
-            context = self.knowledge_base.get_context_for_situation(
-                situation=query,
-                position=situation.get("position", ""),
-                stacks=situation.get("stack_size", ""),
-                pot_odds=str(situation.get("pot_size", "")),
-            )
+        try:
+            queries = [self._build_search_query(s) for s in situations]
+            contexts: List[Optional[str]] = [self._l1_get(q) for q in queries]
+
+            # Serve what we can from the semantic cache
+            pending = [i for i, context in enumerate(contexts) if context is None]
+            embeddings: Dict[int, Any] = {}
+            if self._sem_cache and pending:
+                vectors = self._sem_cache.embed_batch([queries[i] for i in pending])
+                for i, vector in zip(pending, vectors):
+                    embeddings[i] = vector
+                    contexts[i] = self._sem_cache.lookup(vector)
+                    if contexts[i] is not None:
+                        self._l1_put(queries[i], contexts[i])  # type: ignore
+
+            # Fetch all misses with a single batched knowledge base query
+            misses = [i for i in pending if contexts[i] is None]
+            if misses:
+                fetched = self.knowledge_base.get_contexts_for_situations(
+                    [self._context_request(situations[i], queries[i]) for i in misses]
+                )
+                for i, context in zip(misses, fetched):
+                    contexts[i] = context
+                    self._l1_put(queries[i], context)
+                    if i in embeddings:
+                        self._sem_cache.store(embeddings[i], queries[i], context)
 
-            return context
+            return contexts  # type: ignore
 
         except Exception as e:
             logger.error(f"Error searching knowledge base: {e}")
-            return "Error accessing strategic knowledge"
+            return ["Error accessing strategic knowledge"] * len(situations)
 
     def apply_jonathan_framework(
         self, situation: Dict[str, Any], context: str
-    ) -> Dict[str, str]:
-        """Apply Jonathan Little's strategic framework to the situation"""
-
-        framework_analysis = {
-            "range_analysis": "Analyzing hand ranges based on position and action",
-            "bet_sizing": "Optimal bet sizing for value and bluffs",
-            "opponent_tendencies": "Reading opponent patterns and adjustments",
-            "gto_vs_exploitative": "Balancing theoretical optimal play with exploitative adjustments",
-        }
+    ) -> Mapping[str, str]:
+        """Apply Jonathan Little's strategic framework to the situation
+
+        Returns the shared read-only defaults when nothing in the situation
+        overrides them; callers must treat the result as read-only.
+        """
+        return self._framework_apply_context(self._framework_base(situation), context)
+
+    def _framework_base(self, situation: Dict[str, Any]) -> Dict[str, str]:
+        """Framework overrides that depend only on the situation, not on KB context"""
+
+        overrides = {}
 
         # Analyze based on situation components
         position = situation.get("position", "").lower()
 
         # Range analysis
-        if position in ["btn", "button", "co", "cutoff"]:
-            framework_analysis["range_analysis"] = (
+        if position in _LATE_POS:
+            overrides["range_analysis"] = (
                 "Late position allows for wider opening ranges and more bluffing opportunities"
             )
-        elif position in ["utg", "ep"]:
-            framework_analysis["range_analysis"] = (
+        elif position in _EARLY_POS:
+            overrides["range_analysis"] = (
                 "Early position requires tight ranges and strong hands"
             )
-        elif position in ["bb", "sb"]:
-            framework_analysis["range_analysis"] = (
+        elif position in _BLIND_POS:
+            overrides["range_analysis"] = (
                 "Blind positions require careful defense frequency calculations"
             )
 
@@ -132,65 +278,137 @@ Always provide context from the knowledge base when available, and explain how t
                 bet_ratio = bet_size / pot_size
 
                 if bet_ratio < 0.5:
-                    framework_analysis["bet_sizing"] = (
+                    overrides["bet_sizing"] = (
                         "Small bet size suggests value betting or pot control"
                     )
                 elif bet_ratio > 1.0:
-                    framework_analysis["bet_sizing"] = (
+                    overrides["bet_sizing"] = (
                         "Large bet size indicates strong hand or big bluff"
                     )
                 else:
-                    framework_analysis["bet_sizing"] = (
+                    overrides["bet_sizing"] = (
                         "Standard bet sizing, analyze based on range and position"
                     )
 
+        return overrides
+
+    def _framework_apply_context(
+        self, overrides: Dict[str, str], context: str
+    ) -> Mapping[str, str]:
+        """Add context-dependent overrides and merge onto the defaults"""
+
         # GTO vs Exploitative decision
-        if "aggressive" in context.lower() or "loose" in context.lower():
-            framework_analysis["gto_vs_exploitative"] = (
+        tags = {match.lower() for match in _TAG_RE.findall(context)}
+        if tags & _LOOSE_TAGS:
+            overrides["gto_vs_exploitative"] = (
                 "Opponent appears loose/aggressive - tighten up and value bet more"
             )
-        elif "tight" in context.lower() or "passive" in context.lower():
-            framework_analysis["gto_vs_exploitative"] = (
+        elif tags & _TIGHT_TAGS:
+            overrides["gto_vs_exploitative"] = (
                 "Opponent appears tight/passive - can bluff more and value bet thinner"
             )
 
-        return framework_analysis
+        if not overrides:
+            return _FRAMEWORK_DEFAULTS
+        return {**_FRAMEWORK_DEFAULTS, **overrides}
 
     def get_recommendation(self, situation: Dict[str, Any]) -> Dict[str, Any]:
         """Get recommendation based on Jonathan Little's strategies"""
 
-        # Search for relevant strategies
-        strategic_context = self.search_relevant_strategies(situation)
+        # Search for relevant strategies; offline agents skip query building
+        strategic_context = (
+            self.search_relevant_strategies(situation) if self.knowledge_base else ""
+        )
 
-        # Apply Jonathan's framework
-        framework = self.apply_jonathan_framework(situation, strategic_context)
+        return self._build_recommendation(situation, strategic_context)
 
-        # Generate recommendation based on context and framework
-        recommendation = "Apply balanced GTO approach with exploitative adjustments"
-        confidence = 0.7
+    async def aget_recommendation(self, situation: Dict[str, Any]) -> Dict[str, Any]:
+        """Async recommendation - awaits the knowledge base lookup"""
+        if not self.knowledge_base:
+            return self._build_recommendation(situation, "")
 
-        # Analyze specific situation elements
-        reasoning_parts = []
+        # Submit the lookup to the executor first so the context-free framework
+        # work runs while the knowledge base query is in flight
+        search = asyncio.get_running_loop().run_in_executor(
+            None, self.search_relevant_strategies, situation
+        )
+        base = self._framework_base(situation)
+        strategic_context = await search
+
+        return self._build_recommendation(
+            situation,
+            strategic_context,
+            self._framework_apply_context(base, strategic_context),
+        )
 
+    def get_recommendation_batch(
+        self, situations: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Get recommendations for several situations with one knowledge base lookup"""
+        if not self.knowledge_base:
+            return [self._build_recommendation(situation, "") for situation in situations]
+
+        contexts = self.search_relevant_strategies_batch(situations)
+        return [
+            self._build_recommendation(situation, context)
+            for situation, context in zip(situations, contexts)
+        ]
+
+    def _reasoning_iter(
+        self,
+        situation: Dict[str, Any],
+        strategic_context: str,
+        framework: Mapping[str, str],
+    ) -> Iterator[str]:
+        """Yield the reasoning lines for a recommendation"""
+        # Analyze specific situation elements
         if strategic_context and len(strategic_context) > 50:
-            reasoning_parts.append("=== Relevant WPH Insights ===")
-            reasoning_parts.append(
-                strategic_context[:400] + "..."
+            yield "=== Relevant WPH Insights ==="
+            yield (
+                f"{strategic_context[:400]}..."
                 if len(strategic_context) > 400
                 else strategic_context
             )
-            confidence = 0.8
 
-        reasoning_parts.append("\n=== Jonathan Little Framework Analysis ===")
+        yield "\n=== Jonathan Little Framework Analysis ==="
         for aspect, analysis in framework.items():
-            reasoning_parts.append(f"{aspect.replace('_', ' ').title()}: {analysis}")
+            yield f"{aspect.replace('_', ' ').title()}: {analysis}"
+
+        # Check if we have betting action
+        bet_to_call = situation.get("bet_to_call", 0)
+        if bet_to_call > 0:
+            pot_odds_needed = (
+                bet_to_call / (situation.get("pot_size", 0) + bet_to_call) * 100
+            )
+            yield f"\nFacing bet - need {pot_odds_needed:.1f}% equity to call"
+
+    def _build_recommendation(
+        self,
+        situation: Dict[str, Any],
+        strategic_context: str,
+        framework: Optional[Mapping[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Build a recommendation from a situation and its strategic context"""
+
+        # Apply Jonathan's framework
+        if framework is None:
+            framework = self.apply_jonathan_framework(situation, strategic_context)
+
+        # Generate recommendation based on context and framework
+        recommendation = "Apply balanced GTO approach with exploitative adjustments"
+        confidence = 0.7
+
+        if strategic_context and len(strategic_context) > 50:
+            confidence = 0.8
 
         # Specific recommendations based on situation
-        if situation.get("hole_cards") and situation.get("position"):
-            hole_cards = situation["hole_cards"]
-            position = situation["position"].lower()
+        hole_cards = situation.get("hole_cards") or ""
+        position = (situation.get("position") or "").lower()
+
+        if hole_cards and position:
+            hand = hole_cards.upper()
 
-            if hole_cards.upper() in ["AA", "KK", "QQ", "AK"]:
+            if hand in _PREMIUM:
                 recommendation = (
                     f"Premium hand ({hole_cards}) - bet for value, build pot"
                 )
@@ -200,30 +418,15 @@ Always provide context from the knowledge base when available, and explain how t
                     f"In position with {hole_cards} - can play more aggressively"
                 )
                 confidence = 0.8
-            elif position in ["utg", "ep"] and hole_cards.upper() not in [
-                "AA",
-                "KK",
-                "QQ",
-                "JJ",
-                "AK",
-            ]:
+            elif position in _EARLY_POS and hand not in _STRONG_EP:
                 recommendation = (
                     f"Early position with {hole_cards} - consider tighter play"
                 )
                 confidence = 0.8
 
-        # Check if we have betting action
-        if situation.get("bet_to_call", 0) > 0:
-            pot_odds_needed = (
-                situation["bet_to_call"]
-                / (situation.get("pot_size", 0) + situation["bet_to_call"])
-                * 100
-            )
-            reasoning_parts.append(
-                f"\nFacing bet - need {pot_odds_needed:.1f}% equity to call"
-            )
-
-        reasoning = "\n".join(reasoning_parts)
+        reasoning = "\n".join(
+            self._reasoning_iter(situation, strategic_context, framework)
+        )
 
         return {
             "agent": self.name,
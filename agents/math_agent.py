@@ -2,8 +2,116 @@
 Math and Odds Agent - Expert in poker mathematics, pot odds, and expected value.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+from functools import lru_cache
+import math
+import numpy as np
+from game.evaluator import parse_cards
+from game.monte_carlo import showdown_counts
 from .base_agent import BasePokerAgent
+from ._math_kernels import (
+    pot_odds_kernel,
+    implied_odds_kernel,
+    breakeven_kernel,
+    betting_ev_kernel,
+)
+
+
+# Pure calculations are cached at module level so `self` doesn't become part
+# of the key; float inputs are quantized to cents by the callers. Results are
+# left unrounded - formatting happens in the human-facing reasoning strings
+
+
+@lru_cache(maxsize=4096)
+def _pot_odds(pot_size: float, bet_to_call: float) -> Tuple[float, str]:
+    """Cached pot odds: (percentage, ratio string)"""
+    pot_odds_percentage, ratio = pot_odds_kernel(pot_size, bet_to_call)
+
+    # Traditional ratio format (e.g., 3:1)
+    ratio_string = "N/A" if math.isnan(ratio) else f"{ratio:.1f}:1"
+
+    return pot_odds_percentage, ratio_string
+
+
+@lru_cache(maxsize=4096)
+def _breakeven_percentage(pot_size: float, bet_size: float) -> float:
+    """Cached breakeven percentage for a bet"""
+    return breakeven_kernel(pot_size, bet_size)
+
+
+# Preflop equity by hand class vs one opponent
+_PREFLOP_EQUITY: Dict[str, float] = {
+    # Premium hands
+    "AA": 85,
+    "KK": 82,
+    "QQ": 80,
+    "JJ": 78,
+    "TT": 75,
+    "AK": 65,
+    "AQ": 60,
+    "AJ": 58,
+    "AT": 55,
+    "KQ": 58,
+    "KJ": 55,
+    "KT": 52,
+    "QJ": 55,
+    "QT": 52,
+    "JT": 55,
+    # Pairs
+    "99": 72,
+    "88": 69,
+    "77": 66,
+    "66": 63,
+    "55": 60,
+    "44": 57,
+    "33": 54,
+    "22": 51,
+    # Suited connectors (approximate)
+    "suited_connectors": 45,
+    "offsuit_connectors": 40,
+}
+
+# Equity scale per extra opponent (index = opponents - 1, up to a full ring)
+_MULTIWAY_SCALE = tuple(0.8**i for i in range(10))
+
+# Runouts per post-flop equity estimate
+_EQUITY_ROLLOUTS = 2000
+
+
+@lru_cache(maxsize=4096)
+def _preflop_equity(hole_cards: str, opponents: int) -> float:
+    """Cached preflop equity: table lookup, scaled down per extra opponent"""
+    scale = _MULTIWAY_SCALE[min(max(opponents - 1, 0), len(_MULTIWAY_SCALE) - 1)]
+    return _PREFLOP_EQUITY.get(hole_cards, 45) * scale
+
+
+def _hand_equity(hole_cards: str, board: str, opponents: int) -> Tuple[float, str]:
+    """Equity estimate: (equity percentage, confidence)
+
+    Post-flop estimates are Monte Carlo samples, so only the preflop table
+    lookup is cached.
+    """
+    if not board:
+        return _preflop_equity(hole_cards, opponents), "medium"
+
+    # Post-flop: share of the pot over random runouts against random hands
+    cards = parse_cards(hole_cards, board)
+    if cards is None or not 5 <= len(cards) <= 7:
+        return 35.0, "low"  # Unreadable cards - rough drawing-hand estimate
+    cards = cards.astype(np.int64)
+    deck = np.setdiff1d(np.arange(52), cards)
+    opponents = min(max(opponents, 1), len(_MULTIWAY_SCALE))
+    wins, ties, _ = showdown_counts(
+        _EQUITY_ROLLOUTS, cards[:2], cards[2:], deck, opponents
+    )
+    return float(wins + ties / 2) / _EQUITY_ROLLOUTS * 100, "medium"
+
+
+# Actions compared in the EV analysis, in tie-break order
+_ACTIONS = ("fold", "call", "raise")
+
+# Percent -> uint8 scale for quantized equity (100% maps to 255)
+_EQUITY_U8_SCALE = 2.55
 
 
 class MathAgent(BasePokerAgent):
@@ -61,26 +169,33 @@ BETTING MATH:
         if bet_to_call <= 0:
             return {"error": "No bet to call"}
 
-        total_pot_after_call = pot_size + bet_to_call
-        pot_odds_ratio = bet_to_call / total_pot_after_call
-        pot_odds_percentage = pot_odds_ratio * 100
-
-        # Traditional ratio format (e.g., 3:1)
-        if pot_odds_ratio != 0:
-            ratio = (1 / pot_odds_ratio) - 1
-            ratio_string = f"{ratio:.1f}:1"
-        else:
-            ratio_string = "N/A"
+        pot_odds_percentage, ratio_string = _pot_odds(
+            round(float(pot_size), 2), round(float(bet_to_call), 2)
+        )
 
         return {
-            "pot_odds_percentage": round(pot_odds_percentage, 1),
+            "pot_odds_percentage": pot_odds_percentage,
             "pot_odds_ratio": ratio_string,
-            "required_equity": round(pot_odds_percentage, 1),
+            "required_equity": pot_odds_percentage,
             "call_amount": bet_to_call,
-            "pot_after_call": total_pot_after_call,
+            "pot_after_call": pot_size + bet_to_call,
             "getting_odds": f"{ratio_string} odds",
         }
 
+    def calculate_pot_odds_grid(
+        self, pot_size: float, bets: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Vectorized pot odds over an array of bet sizes (e.g. a sizing ladder)"""
+        bets = np.asarray(bets, dtype=np.float64)
+        total = pot_size + bets
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pot_odds_ratio = bets / total
+            # Match the scalar kernel: no ratio when there is no bet to call
+            ratio = np.where(pot_odds_ratio > 0, 1.0 / pot_odds_ratio - 1.0, np.nan)
+
+        return {"pct": pot_odds_ratio * 100.0, "ratio": ratio, "total": total}
+
     def calculate_implied_odds(
         self,
         pot_size: float,
@@ -91,102 +206,78 @@ BETTING MATH:
         """Calculate implied odds including future winnings"""
 
         total_potential_winnings = pot_size + implied_winnings
-        implied_odds_ratio = bet_to_call / total_potential_winnings
-        implied_odds_percentage = implied_odds_ratio * 100
+        implied_odds_percentage = implied_odds_kernel(
+            float(pot_size), float(bet_to_call), float(implied_winnings)
+        )
 
         # Compare to current equity
         profitable = equity > implied_odds_percentage
 
         return {
-            "implied_odds_percentage": round(implied_odds_percentage, 1),
+            "implied_odds_percentage": implied_odds_percentage,
             "total_potential_winnings": total_potential_winnings,
-            "current_equity_needed": round(implied_odds_percentage, 1),
+            "current_equity_needed": implied_odds_percentage,
             "actual_equity": equity,
             "is_profitable": profitable,
-            "equity_surplus": round(equity - implied_odds_percentage, 1),
+            "equity_surplus": equity - implied_odds_percentage,
         }
 
     def calculate_expected_value(self, actions: Dict[str, Dict]) -> Dict[str, float]:
         """Calculate EV for different actions"""
-        evs = {}
-
-        for action, data in actions.items():
-            win_prob = data.get("win_probability", 0) / 100
-            win_amount = data.get("win_amount", 0)
-            lose_prob = 1 - win_prob
-            lose_amount = data.get("lose_amount", 0)
+        n = len(actions)
+        data = actions.values()
+
+        evs = self.calculate_expected_value_batch(
+            np.fromiter(
+                (d.get("win_probability", 0) for d in data), dtype=np.float64, count=n
+            ),
+            np.fromiter(
+                (d.get("win_amount", 0) for d in data), dtype=np.float64, count=n
+            ),
+            np.fromiter(
+                (d.get("lose_amount", 0) for d in data), dtype=np.float64, count=n
+            ),
+        )
 
-            ev = (win_prob * win_amount) - (lose_prob * lose_amount)
-            evs[action] = round(ev, 2)
+        return dict(zip(actions, evs.tolist()))
 
-        return evs
+    def calculate_expected_value_batch(
+        self, win_probability: np.ndarray, win_amount: np.ndarray, lose_amount: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized EV over arrays of win probability (%), win and lose amounts"""
+        win_prob = np.asarray(win_probability, dtype=np.float64) / 100
+        return win_prob * win_amount - (1 - win_prob) * lose_amount
 
     def calculate_breakeven_percentage(self, pot_size: float, bet_size: float) -> float:
         """Calculate breakeven percentage for a bet"""
-        return round((bet_size / (pot_size + bet_size)) * 100, 1)
+        return _breakeven_percentage(round(float(pot_size), 2), round(float(bet_size), 2))
 
     def estimate_hand_equity(
         self, hole_cards: str, board: str = "", opponents: int = 1
     ) -> Dict[str, Any]:
         """Estimate hand equity (simplified calculation)"""
-        # This is a simplified version - real implementation would use Monte Carlo simulation
-
-        equity_estimate = 50.0  # Default
-        confidence = "low"
-
-        if not board:  # Pre-flop
-            preflop_equities = {
-                # Premium hands
-                "AA": 85,
-                "KK": 82,
-                "QQ": 80,
-                "JJ": 78,
-                "TT": 75,
-                "AK": 65,
-                "AQ": 60,
-                "AJ": 58,
-                "AT": 55,
-                "KQ": 58,
-                "KJ": 55,
-                "KT": 52,
-                "QJ": 55,
-                "QT": 52,
-                "JT": 55,
-                # Pairs
-                "99": 72,
-                "88": 69,
-                "77": 66,
-                "66": 63,
-                "55": 60,
-                "44": 57,
-                "33": 54,
-                "22": 51,
-                # Suited connectors (approximate)
-                "suited_connectors": 45,
-                "offsuit_connectors": 40,
-            }
-
-            equity_estimate = preflop_equities.get(hole_cards.upper(), 45)
-            confidence = "medium"
-
-            # Adjust for number of opponents
-            if opponents > 1:
-                equity_estimate *= 0.8 ** (opponents - 1)
-
-        else:  # Post-flop - very simplified
-            if "pair" in hole_cards.lower():
-                equity_estimate = 65  # Rough estimate for made hands
-            else:
-                equity_estimate = 35  # Drawing hands
-            confidence = "low"  # Would need proper calculation
+        equity_estimate, confidence = _hand_equity(
+            hole_cards.upper(), board, opponents
+        )
 
         return {
-            "equity_percentage": round(equity_estimate, 1),
+            "equity_percentage": equity_estimate,
             "confidence": confidence,
             "opponents": opponents,
             "board": board or "preflop",
         }
 
+    def estimate_hand_equity_u8(
+        self, hole_cards: str, board: str = "", opponents: int = 1
+    ) -> np.uint8:
+        """Equity quantized to 0-255 for compact model inputs
+
+        Decode with ``equity_pct = x / 2.55``; the float path stays in
+        estimate_hand_equity for human-facing reasoning.
+        """
+        equity, _ = _hand_equity(hole_cards.upper(), board, opponents)
+        return np.uint8(min(max(round(equity * _EQUITY_U8_SCALE), 0), 255))
+
     def analyze_betting_decision(self, situation: Dict[str, Any]) -> Dict[str, Any]:
         """Comprehensive mathematical analysis of a betting decision"""
 
@@ -212,24 +303,53 @@ BETTING MATH:
             equity_pct = equity_data["equity_percentage"]
 
             # Simplified EV calculations
-            ev_fold = 0  # Always 0
+            ev_fold = 0.0  # Always 0
 
-            # EV of calling
-            total_pot_after_call = pot_size + bet_to_call
-            ev_call = (equity_pct / 100 * total_pot_after_call) - bet_to_call
-
-            # EV of raising (simplified - assumes fold equity)
+            # EV of calling, and of raising (simplified - assumes fold equity)
             fold_equity = 0.3  # Assume 30% fold equity
-            ev_raise = (fold_equity * pot_size) + ((1 - fold_equity) * ev_call)
+            ev_call, ev_raise = betting_ev_kernel(
+                float(equity_pct), float(pot_size), float(bet_to_call), fold_equity
+            )
 
             analysis["expected_values"] = {
-                "fold": round(ev_fold, 2),
-                "call": round(ev_call, 2),
-                "raise": round(ev_raise, 2),
+                "fold": ev_fold,
+                "call": ev_call,
+                "raise": ev_raise,
             }
 
         return analysis
 
+    def analyze_betting_decision_grid(
+        self, situation: Dict[str, Any], bets: np.ndarray
+    ) -> Dict[str, Any]:
+        """Pot odds and fold/call/raise EVs across an array of bet sizes"""
+
+        pot_size = float(situation.get("pot_size", 0))
+        equity_data = self.estimate_hand_equity(
+            situation.get("hole_cards", ""),
+            situation.get("board", ""),
+            situation.get("opponents", 1),
+        )
+
+        pot_odds = self.calculate_pot_odds_grid(pot_size, bets)
+        bets = np.asarray(bets, dtype=np.float64)
+
+        # Same simplified model as analyze_betting_decision, broadcast over bets
+        fold_equity = 0.3
+        ev_call = equity_data["equity_percentage"] / 100.0 * pot_odds["total"] - bets
+        ev_raise = fold_equity * pot_size + (1.0 - fold_equity) * ev_call
+
+        return {
+            "bets": bets,
+            "pot_odds": pot_odds,
+            "equity": equity_data,
+            "expected_values": {
+                "fold": np.zeros_like(bets),
+                "call": ev_call,
+                "raise": ev_raise,
+            },
+        }
+
     def get_recommendation(self, situation: Dict[str, Any]) -> Dict[str, Any]:
         """Get math-based recommendation"""
 
@@ -246,19 +366,19 @@ BETTING MATH:
             required_equity = pot_odds["required_equity"]
 
             reasoning_parts.append(
-                f"Pot odds: {pot_odds['getting_odds']} ({required_equity}% equity needed)"
+                f"Pot odds: {pot_odds['getting_odds']} ({required_equity:.1f}% equity needed)"
             )
-            reasoning_parts.append(f"Estimated equity: {equity}%")
+            reasoning_parts.append(f"Estimated equity: {equity:.1f}%")
 
             if equity > required_equity:
                 recommendation = (
-                    f"CALL - Equity ({equity}%) > Required ({required_equity}%)"
+                    f"CALL - Equity ({equity:.1f}%) > Required ({required_equity:.1f}%)"
                 )
                 confidence = 0.8
                 reasoning_parts.append("✓ Profitable call based on pot odds")
             else:
                 recommendation = (
-                    f"FOLD - Equity ({equity}%) < Required ({required_equity}%)"
+                    f"FOLD - Equity ({equity:.1f}%) < Required ({required_equity:.1f}%)"
                 )
                 confidence = 0.8
                 reasoning_parts.append("✗ Unprofitable call based on pot odds")
@@ -266,16 +386,21 @@ BETTING MATH:
         # EV analysis
         if "expected_values" in analysis:
             evs = analysis["expected_values"]
-            best_action = max(evs.items(), key=lambda x: x[1])
+            ev_arr = np.array([evs[action] for action in _ACTIONS])
+            idx = int(ev_arr.argmax())
+            best_action = (_ACTIONS[idx], float(ev_arr[idx]))
 
-            reasoning_parts.append(f"Expected Values: {evs}")
             reasoning_parts.append(
-                f"Best EV action: {best_action[0]} (+{best_action[1]})"
+                "Expected Values: "
+                + ", ".join(f"{action} {ev:+.2f}" for action, ev in evs.items())
+            )
+            reasoning_parts.append(
+                f"Best EV action: {best_action[0]} ({best_action[1]:+.2f})"
             )
 
             if best_action[1] > 0:
                 recommendation = (
-                    f"{best_action[0].upper()} - Best EV (+{best_action[1]})"
+                    f"{best_action[0].upper()} - Best EV ({best_action[1]:+.2f})"
                 )
                 confidence = 0.7
 
@@ -2,15 +2,47 @@
 Position and Range Agent - Expert in positional strategy and hand ranges.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, FrozenSet, Optional, Tuple
+from functools import lru_cache
+import re
 from .base_agent import BasePokerAgent
 
+# Action keywords that change the advice; matched in one pass
+_ACTION_RE = re.compile(r"raise|fold", re.IGNORECASE)
 
-class PositionAgent(BasePokerAgent):
-    """Agent specializing in positional play and hand ranges"""
+# Positions that can be named as the raiser in an action history
+_RAISER_RE = re.compile(r"\b(utg|mp|co|btn|button|sb)\b", re.IGNORECASE)
 
-    def __init__(self, llm_config: Dict[str, Any]):
-        system_message = """
+# Position strength (1-6, higher is better), keyed by lowercase position
+_POSITION_STRENGTH = {
+    "utg": 1,
+    "ep": 1,
+    "mp": 2,
+    "mp1": 2,
+    "mp2": 2,
+    "co": 3,
+    "lp": 3,
+    "btn": 4,
+    "button": 4,
+    "sb": 2,  # Good postflop but bad preflop
+    "bb": 3,  # Good preflop (last to act) but bad postflop
+}
+
+# Premium 3-bet hands (always 3-bet)
+_PREMIUM_3BET = frozenset({"AA", "KK", "QQ", "AK"})
+
+# Position-dependent 3-bet hands
+_GOOD_3BET = frozenset({"JJ", "1010", "AQ"})
+_BLUFF_3BET = frozenset({"A5", "A4", "A3", "A2", "K9", "Q9", "J9", "T9"})
+
+
+def _action_keywords(action_history: str) -> set:
+    """Lowercase action keywords present anywhere in an action history"""
+    return {match.lower() for match in _ACTION_RE.findall(action_history)}
+
+
+# System prompt shared by every PositionAgent instance
+_POSITION_SYS_MSG = """
 You are the Position and Range Expert for No Limit Texas Hold'em poker.
 
 Your expertise includes:
@@ -44,145 +76,156 @@ Key principles:
 2. Widen ranges in late position
 3. Consider opponent's position when making decisions
 4. Use position to gain information and control betting
-        """
+"""
 
+
+class PositionAgent(BasePokerAgent):
+    """Agent specializing in positional play and hand ranges"""
+
+    def __init__(self, llm_config: Dict[str, Any]):
         super().__init__(
             name="PositionAgent",
-            system_message=system_message,
+            system_message=_POSITION_SYS_MSG,
             specialty="Position and Hand Ranges",
             llm_config=llm_config,
         )
 
+        # Recommendations depend only on position, hole cards and action history,
+        # so identical situations across agent turns reuse the assembled strings
+        self._recommend_cached = lru_cache(maxsize=1024)(self._recommend)
+
         # Define opening ranges for each position
-        self.opening_ranges = {
-            "utg": ["AA", "KK", "QQ", "JJ", "1010", "99", "AK", "AQ", "AJ", "KQ"],
-            "mp": [
-                "AA",
-                "KK",
-                "QQ",
-                "JJ",
-                "1010",
-                "99",
-                "88",
-                "77",
-                "AK",
-                "AQ",
-                "AJ",
-                "AT",
-                "KQ",
-                "KJ",
-            ],
-            "co": [
-                "AA",
-                "KK",
-                "QQ",
-                "JJ",
-                "1010",
-                "99",
-                "88",
-                "77",
-                "66",
-                "55",
-                "AK",
-                "AQ",
-                "AJ",
-                "AT",
-                "A9",
-                "KQ",
-                "KJ",
-                "QJ",
-            ],
-            "btn": [
-                "AA",
-                "KK",
-                "QQ",
-                "JJ",
-                "1010",
-                "99",
-                "88",
-                "77",
-                "66",
-                "55",
-                "44",
-                "33",
-                "22",
-                "AK",
-                "AQ",
-                "AJ",
-                "AT",
-                "A9",
-                "A8",
-                "A7",
-                "A6",
-                "A5",
-                "A4",
-                "A3",
-                "A2",
-                "KQ",
-                "KJ",
-                "KT",
-                "K9",
-                "QJ",
-                "QT",
-                "JT",
-            ],
-            "sb": [
-                "AA",
-                "KK",
-                "QQ",
-                "JJ",
-                "1010",
-                "99",
-                "88",
-                "77",
-                "66",
-                "AK",
-                "AQ",
-                "AJ",
-                "AT",
-                "A9",
-                "KQ",
-                "KJ",
-                "QJ",
-            ],
-            "bb": "defend_vs_open",  # Defending range depends on opener's position
+        self.opening_ranges: Dict[str, Optional[FrozenSet[str]]] = {
+            "utg": frozenset(
+                {"AA", "KK", "QQ", "JJ", "1010", "99", "AK", "AQ", "AJ", "KQ"}
+            ),
+            "mp": frozenset(
+                {
+                    "AA",
+                    "KK",
+                    "QQ",
+                    "JJ",
+                    "1010",
+                    "99",
+                    "88",
+                    "77",
+                    "AK",
+                    "AQ",
+                    "AJ",
+                    "AT",
+                    "KQ",
+                    "KJ",
+                }
+            ),
+            "co": frozenset(
+                {
+                    "AA",
+                    "KK",
+                    "QQ",
+                    "JJ",
+                    "1010",
+                    "99",
+                    "88",
+                    "77",
+                    "66",
+                    "55",
+                    "AK",
+                    "AQ",
+                    "AJ",
+                    "AT",
+                    "A9",
+                    "KQ",
+                    "KJ",
+                    "QJ",
+                }
+            ),
+            "btn": frozenset(
+                {
+                    "AA",
+                    "KK",
+                    "QQ",
+                    "JJ",
+                    "1010",
+                    "99",
+                    "88",
+                    "77",
+                    "66",
+                    "55",
+                    "44",
+                    "33",
+                    "22",
+                    "AK",
+                    "AQ",
+                    "AJ",
+                    "AT",
+                    "A9",
+                    "A8",
+                    "A7",
+                    "A6",
+                    "A5",
+                    "A4",
+                    "A3",
+                    "A2",
+                    "KQ",
+                    "KJ",
+                    "KT",
+                    "K9",
+                    "QJ",
+                    "QT",
+                    "JT",
+                }
+            ),
+            "sb": frozenset(
+                {
+                    "AA",
+                    "KK",
+                    "QQ",
+                    "JJ",
+                    "1010",
+                    "99",
+                    "88",
+                    "77",
+                    "66",
+                    "AK",
+                    "AQ",
+                    "AJ",
+                    "AT",
+                    "A9",
+                    "KQ",
+                    "KJ",
+                    "QJ",
+                }
+            ),
+            # Defending range depends on opener's position - always defend
+            "bb": None,
         }
 
     def get_position_strength(self, position: str) -> int:
-        """Get position strength (1-6, higher is better)"""
-        position_map = {
-            "utg": 1,
-            "ep": 1,
-            "mp": 2,
-            "mp1": 2,
-            "mp2": 2,
-            "co": 3,
-            "lp": 3,
-            "btn": 4,
-            "button": 4,
-            "sb": 2,  # Good postflop but bad preflop
-            "bb": 3,  # Good preflop (last to act) but bad postflop
-        }
-        return position_map.get(position.lower(), 2)
+        """Get position strength (1-6, higher is better) for a lowercase position"""
+        return _POSITION_STRENGTH.get(position, 2)
 
     def is_hand_in_range(self, hand: str, position: str) -> bool:
         """Check if a hand is in the opening range for a position"""
-        position = position.lower()
+        return self._in_range(hand.upper(), position.lower())
+
+    def _in_range(self, hand: str, position: str) -> bool:
+        """is_hand_in_range for an already uppercase hand and lowercase position"""
         if position not in self.opening_ranges:
             return False
 
         range_hands = self.opening_ranges[position]
-        if range_hands == "defend_vs_open":
-            return True  # BB defending range is context-dependent
-
-        return hand.upper() in range_hands
+        return range_hands is None or hand in range_hands
 
     def get_positional_advice(self, situation: Dict[str, Any]) -> str:
         """Get position-specific advice"""
-        position = situation.get("position", "").lower()
-        hole_cards = situation.get("hole_cards", "")
-        action_to_us = situation.get("action_history", "")
+        return self._positional_advice(
+            situation.get("position", "").lower(),
+            situation.get("hole_cards", ""),
+            _action_keywords(situation.get("action_history", "")),
+        )
 
+    def _positional_advice(self, position: str, hole_cards: str, actions: set) -> str:
+        """Position-specific advice for a lowercase position and action keywords"""
         advice = []
 
         # Position-specific guidance
@@ -200,7 +243,7 @@ Key principles:
 
         # Range advice
         if hole_cards:
-            in_range = self.is_hand_in_range(hole_cards, position)
+            in_range = self._in_range(hole_cards.upper(), position)
             if in_range:
                 advice.append(
                     f"{hole_cards} is in opening range for {position.upper()}"
@@ -211,10 +254,10 @@ Key principles:
                 )
 
         # Action advice based on what happened before us
-        if "raise" in action_to_us.lower():
+        if "raise" in actions:
             advice.append("Facing a raise - need stronger range to continue")
             advice.append("Consider 3-betting with premium hands and some bluffs")
-        elif "fold" in action_to_us.lower():
+        elif "fold" in actions:
             advice.append(
                 "Players folded to you - good stealing opportunity if in position"
             )
@@ -226,23 +269,16 @@ Key principles:
     ) -> Dict[str, Any]:
         """Determine if we should 3-bet based on position and hand"""
 
-        # Premium 3-bet hands (always 3-bet)
-        premium_3bet = ["AA", "KK", "QQ", "AK"]
-
-        # Position-dependent 3-bet hands
-        good_3bet = ["JJ", "1010", "AQ"]
-        bluff_3bet = ["A5", "A4", "A3", "A2", "K9", "Q9", "J9", "T9"]
-
-        our_pos_strength = self.get_position_strength(position)
-        raiser_pos_strength = self.get_position_strength(raiser_position)
+        our_pos_strength = self.get_position_strength(position.lower())
+        raiser_pos_strength = self.get_position_strength(raiser_position.lower())
 
         should_3bet = False
         reason = ""
 
-        if hole_cards in premium_3bet:
+        if hole_cards in _PREMIUM_3BET:
             should_3bet = True
             reason = f"{hole_cards} is premium - always 3-bet for value"
-        elif hole_cards in good_3bet:
+        elif hole_cards in _GOOD_3BET:
             if our_pos_strength >= raiser_pos_strength:
                 should_3bet = True
                 reason = f"{hole_cards} is strong enough to 3-bet from {position} vs {raiser_position}"
@@ -250,7 +286,7 @@ Key principles:
                 reason = (
                     f"{hole_cards} is borderline - be more cautious out of position"
                 )
-        elif hole_cards in bluff_3bet:
+        elif hole_cards in _BLUFF_3BET:
             if our_pos_strength > raiser_pos_strength:
                 should_3bet = True
                 reason = f"{hole_cards} good 3-bet bluff with position vs {raiser_position} opener"
@@ -263,29 +299,46 @@ Key principles:
             "should_3bet": should_3bet,
             "reason": reason,
             "hand_category": "premium"
-            if hole_cards in premium_3bet
+            if hole_cards in _PREMIUM_3BET
             else "value"
-            if hole_cards in good_3bet
+            if hole_cards in _GOOD_3BET
             else "bluff"
-            if hole_cards in bluff_3bet
+            if hole_cards in _BLUFF_3BET
             else "fold/call",
         }
 
     def get_recommendation(self, situation: Dict[str, Any]) -> Dict[str, Any]:
         """Get position-based recommendation"""
-        position = situation.get("position", "")
-        hole_cards = situation.get("hole_cards", "")
-        action_history = situation.get("action_history", "")
+        # Normalize once; the helpers below expect a lowercase position
+        recommendation, confidence, reasoning = self._recommend_cached(
+            situation.get("position", "").lower(),
+            situation.get("hole_cards", ""),
+            situation.get("action_history", ""),
+        )
+
+        return {
+            "agent": self.name,
+            "specialty": self.specialty,
+            "recommendation": recommendation,
+            "confidence": confidence,
+            "reasoning": reasoning,
+        }
+
+    def _recommend(
+        self, position: str, hole_cards: str, action_history: str
+    ) -> Tuple[str, float, str]:
+        """(recommendation, confidence, reasoning) for a lowercase position"""
+        actions = _action_keywords(action_history)
 
         # Get positional advice
-        advice = self.get_positional_advice(situation)
+        advice = self._positional_advice(position, hole_cards, actions)
 
         # Determine recommendation
         recommendation = "Check position and ranges"
         confidence = 0.7
 
         if hole_cards and position:
-            if "raise" in action_history.lower():
+            if "raise" in actions:
                 # Facing a raise - 3-bet analysis
                 raiser_pos = self._extract_raiser_position(action_history)
                 three_bet_analysis = self.should_3bet(hole_cards, position, raiser_pos)
@@ -300,7 +353,7 @@ Key principles:
                     confidence = 0.7
             else:
                 # First to act or facing limpers
-                if self.is_hand_in_range(hole_cards, position):
+                if self._in_range(hole_cards.upper(), position):
                     recommendation = (
                         f"Open raise with {hole_cards} from {position.upper()}"
                     )
@@ -311,26 +364,13 @@ Key principles:
 
         reasoning = f"Position analysis for {position.upper()}:\n{advice}"
 
-        return {
-            "agent": self.name,
-            "specialty": self.specialty,
-            "recommendation": recommendation,
-            "confidence": confidence,
-            "reasoning": reasoning,
-        }
+        return recommendation, confidence, reasoning
 
     def _extract_raiser_position(self, action_history: str) -> str:
         """Extract the position of the raiser from action history"""
-        # Simplified - would need proper parsing in real implementation
-        if "utg" in action_history.lower():
-            return "utg"
-        elif "mp" in action_history.lower():
-            return "mp"
-        elif "co" in action_history.lower():
-            return "co"
-        elif "btn" in action_history.lower() or "button" in action_history.lower():
-            return "btn"
-        elif "sb" in action_history.lower():
-            return "sb"
-        else:
+        # Simplified - first position named in the history
+        match = _RAISER_RE.search(action_history)
+        if not match:
             return "unknown"
+        position = match.group(1).lower()
+        return "btn" if position == "button" else position
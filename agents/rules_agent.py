@@ -3,14 +3,16 @@ Rules and Mechanics Agent - Expert in No Limit Texas Hold'em rules and game mech
 """
 
 from typing import Dict, Any
+import numpy as np
 from .base_agent import BasePokerAgent
+from game.evaluator import CATEGORY_NAMES, STRAIGHT_FLUSH, parse_cards
+from game.hand_eval_table import eval7, rank_class
 
+# Strength (1-10 scale) for each evaluator hand category, weakest first
+_CATEGORY_STRENGTH = (1, 3, 5, 6, 7, 8, 9, 10, 10)
 
-class RulesAgent(BasePokerAgent):
-    """Agent specializing in poker rules, hand rankings, and game mechanics"""
-
-    def __init__(self, llm_config: Dict[str, Any]):
-        system_message = """
+# System prompt shared by every RulesAgent instance
+_RULES_SYS_MSG = """
 You are the Rules and Mechanics Expert for No Limit Texas Hold'em poker.
 
 Your expertise includes:
@@ -43,11 +45,16 @@ When analyzing a situation, always ensure:
 2. Betting sizes meet minimum requirements
 3. Hand rankings are correctly identified
 4. Game flow follows proper sequence
-        """
+"""
+
 
+class RulesAgent(BasePokerAgent):
+    """Agent specializing in poker rules, hand rankings, and game mechanics"""
+
+    def __init__(self, llm_config: Dict[str, Any]):
         super().__init__(
             name="RulesAgent",
-            system_message=system_message,
+            system_message=_RULES_SYS_MSG,
             specialty="Rules and Game Mechanics",
             llm_config=llm_config,
         )
@@ -90,15 +97,22 @@ When analyzing a situation, always ensure:
         self, hole_cards: str, board: str = ""
     ) -> Dict[str, Any]:
         """Evaluate the strength of a poker hand"""
-        # This is a simplified version - would use proper hand evaluator in real implementation
         evaluation = {
             "hand_type": "High Card",
             "strength": 1,  # 1-10 scale
             "description": "Hand strength evaluation",
         }
 
+        # Made hands once there is a board to evaluate against
+        cards = parse_cards(hole_cards, board) if hole_cards and board else None
+        if cards is not None and len(cards) >= 5:
+            category = STRAIGHT_FLUSH - rank_class(eval7(cards.astype(np.int64)))
+            evaluation["hand_type"] = CATEGORY_NAMES[category]
+            evaluation["strength"] = _CATEGORY_STRENGTH[category]
+            evaluation["description"] = f"{CATEGORY_NAMES[category]} on {board}"
+
         # Basic pocket pair detection
-        if hole_cards and len(hole_cards.split()) == 2:
+        elif hole_cards and len(hole_cards.split()) == 2:
             card1, card2 = hole_cards.split()
             if card1[0] == card2[0]:  # Same rank
                 evaluation["hand_type"] = "Pocket Pair"
@@ -0,0 +1,143 @@
+"""
+Hand categories, starting-hand strength and card parsing helpers.
+Cards are deck indices (rank * 4 + suit, matching poker_engine.INDEX_CARD) so
+the strength kernel is plain integer math that Numba compiles when installed.
+Made hands are ranked by the lookup tables in game.hand_eval_table.
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
+import numpy as np
+from .poker_engine import CARD_INDEX
+
+try:
+    from numba import njit  # type: ignore
+except ImportError:  # Numba is optional - the evaluator runs as plain Python
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Hand categories, weakest to strongest; game.hand_eval_table.rank_class
+# counts the same categories down from STRAIGHT_FLUSH
+HIGH_CARD = 0
+ONE_PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+
+CATEGORY_NAMES = (
+    "High Card",
+    "One Pair",
+    "Two Pair",
+    "Three of a Kind",
+    "Straight",
+    "Flush",
+    "Full House",
+    "Four of a Kind",
+    "Straight Flush",
+)
+
+
+def _preflop_table() -> np.ndarray:
+    """Base strength of all 169 starting hands as a 13x13 rank grid
+
+    Pairs sit on the diagonal, suited hands at [low, high] and offsuit hands
+    at [high, low].
+    """
+    table = np.empty((13, 13), dtype=np.float64)
+    for high in range(13):
+        for low in range(high + 1):
+            if high == low:
+                if high >= 10:  # QQ+
+                    table[high, low] = 0.85
+                elif high >= 7:  # 99-JJ
+                    table[high, low] = 0.75
+                else:
+                    table[high, low] = 0.65
+            elif high >= 11:  # Ace or king
+                table[low, high] = 0.70
+                table[high, low] = 0.65
+            else:
+                table[low, high] = 0.5
+                table[high, low] = 0.4
+    return table
+
+
+PREFLOP_STRENGTH = _preflop_table()
+
+
+@njit(cache=True)
+def quick_strength(cards: np.ndarray) -> float:
+    """Rough 0-1 strength of the hole cards (first two) on the board (rest)"""
+    ranks = cards.astype(np.int64) >> 2
+    suits = cards.astype(np.int64) & 3
+    high = max(ranks[0], ranks[1])
+    low = min(ranks[0], ranks[1])
+
+    if suits[0] == suits[1]:
+        strength = PREFLOP_STRENGTH[low, high]
+    else:
+        strength = PREFLOP_STRENGTH[high, low]
+
+    # Discount for boards that allow a flush or a straight
+    n = len(cards)
+    if n > 2:
+        suit_mask = 0
+        for i in range(2, n):
+            suit_mask |= 1 << suits[i]
+        n_suits = 0
+        for suit in range(4):
+            n_suits += suit_mask >> suit & 1
+        if n_suits <= 2:
+            strength *= 0.9
+
+        # Any two board ranks next to each other: adjacent bits in the mask
+        rank_mask = 0
+        for i in range(2, n):
+            rank_mask |= 1 << ranks[i]
+        if rank_mask & (rank_mask >> 1):
+            strength *= 0.9
+
+    return min(strength, 1.0)
+
+
+def canonical_cards(cards: np.ndarray) -> Tuple[int, ...]:
+    """Suit-isomorphic key for hole cards (first two) plus board
+
+    Cards are ordered within the hole and the board, and suits are renamed
+    by first appearance, so hands that differ only by suit permutation or
+    card order share a key.
+    """
+    suit_map = {}
+    key = []
+    for group in (cards[:2], cards[2:]):
+        for card in sorted(group.tolist(), reverse=True):
+            suit = suit_map.setdefault(card & 3, len(suit_map))
+            key.append(card & ~3 | suit)
+    return tuple(key)
+
+
+@lru_cache(maxsize=1 << 16)
+def cached_quick_strength(key: Tuple[int, ...]) -> float:
+    """quick_strength for a canonical_cards key, memoized"""
+    return float(quick_strength(np.array(key, dtype=np.uint8)))
+
+
+def parse_cards(*card_strings: str) -> Optional[np.ndarray]:
+    """Parse space-separated cards like 'Ah Kd' into deck indices, or None"""
+    indices = []
+    for cards in card_strings:
+        for token in cards.split():
+            rank, suit = token[:-1].upper(), token[-1:].lower()
+            idx = CARD_INDEX.get(("T" if rank == "10" else rank, suit))
+            if idx is None:
+                return None
+            indices.append(idx)
+    return np.array(indices, dtype=np.uint8)
@@ -0,0 +1,189 @@
+"""
+Cactus-Kev style hand-rank lookup tables.
+All 7462 distinct five-card hand classes are ranked once at import, from 1
+(royal flush) to 7462 (seven-high). A five-card evaluation is then a few
+integer ops plus one table lookup; seven cards take the best of 21 fives.
+Cards are deck indices (rank * 4 + suit, matching poker_engine.INDEX_CARD).
+"""
+
+from functools import lru_cache
+from itertools import combinations
+import numpy as np
+
+try:
+    from numba import njit  # type: ignore
+except ImportError:  # Numba is optional - lookups run as plain Python
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# One prime per rank (deuce..ace): a hand's prime product identifies its ranks
+PRIMES = np.array([2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41], dtype=np.int64)
+
+# Worst rank in each hand class, strongest class first; the index into this
+# table is game.evaluator's category counted down from STRAIGHT_FLUSH
+CLASS_THRESHOLDS = (10, 166, 322, 1599, 1609, 2467, 3325, 6185, 7462)
+
+# Straights as 13-bit rank masks, ace-high first and the wheel last
+_STRAIGHT_MASKS = tuple(0b11111 << (top - 4) for top in range(12, 3, -1)) + (
+    0b1000000001111,
+)
+
+
+def _mask(ranks) -> int:
+    mask = 0
+    for rank in ranks:
+        mask |= 1 << rank
+    return mask
+
+
+def _product(ranks) -> int:
+    product = 1
+    for rank in ranks:
+        product *= int(PRIMES[rank])
+    return product
+
+
+@lru_cache(maxsize=None)
+def _build_tables():
+    """Rank every five-card hand class; returns the three lookup arrays"""
+    flush_lookup = np.zeros(1 << 13, dtype=np.int32)
+    unique5_lookup = np.zeros(1 << 13, dtype=np.int32)
+    products = {}
+
+    # Five distinct ranks, best first: high cards in descending order
+    distinct = [
+        combo
+        for combo in combinations(range(12, -1, -1), 5)
+        if _mask(combo) not in _STRAIGHT_MASKS
+    ]
+    ranks_desc = range(12, -1, -1)
+
+    rank = 1
+    for mask in _STRAIGHT_MASKS:  # Straight flushes
+        flush_lookup[mask] = rank
+        rank += 1
+    for quad in ranks_desc:  # Four of a kind
+        for kicker in ranks_desc:
+            if kicker != quad:
+                products[_product((quad,) * 4 + (kicker,))] = rank
+                rank += 1
+    for trips in ranks_desc:  # Full houses
+        for pair in ranks_desc:
+            if pair != trips:
+                products[_product((trips,) * 3 + (pair,) * 2)] = rank
+                rank += 1
+    for combo in distinct:  # Flushes
+        flush_lookup[_mask(combo)] = rank
+        rank += 1
+    for mask in _STRAIGHT_MASKS:  # Straights
+        unique5_lookup[mask] = rank
+        rank += 1
+    for trips in ranks_desc:  # Three of a kind
+        for kickers in combinations([r for r in ranks_desc if r != trips], 2):
+            products[_product((trips,) * 3 + kickers)] = rank
+            rank += 1
+    for pairs in combinations(ranks_desc, 2):  # Two pair
+        for kicker in ranks_desc:
+            if kicker not in pairs:
+                products[_product(pairs * 2 + (kicker,))] = rank
+                rank += 1
+    for pair in ranks_desc:  # One pair
+        for kickers in combinations([r for r in ranks_desc if r != pair], 3):
+            products[_product((pair,) * 2 + kickers)] = rank
+            rank += 1
+    for combo in distinct:  # High card
+        unique5_lookup[_mask(combo)] = rank
+        rank += 1
+
+    # Paired hands are found by binary search over their sorted prime products
+    keys = np.array(sorted(products), dtype=np.int64)
+    values = np.array([products[key] for key in keys.tolist()], dtype=np.int32)
+    return flush_lookup, unique5_lookup, keys, values
+
+
+FLUSH_LOOKUP, UNIQUE5_LOOKUP, PRODUCT_KEYS, PRODUCT_RANKS = _build_tables()
+
+
+@njit(cache=True)
+def eval5(c0: int, c1: int, c2: int, c3: int, c4: int) -> int:
+    """Rank five cards from 1 (royal flush) to 7462 (seven-high)"""
+    mask = (
+        (1 << (c0 >> 2))
+        | (1 << (c1 >> 2))
+        | (1 << (c2 >> 2))
+        | (1 << (c3 >> 2))
+        | (1 << (c4 >> 2))
+    )
+    suit = c0 & 3
+    if suit == c1 & 3 and suit == c2 & 3 and suit == c3 & 3 and suit == c4 & 3:
+        return FLUSH_LOOKUP[mask]
+
+    unique = UNIQUE5_LOOKUP[mask]
+    if unique:
+        return unique
+
+    product = (
+        PRIMES[c0 >> 2]
+        * PRIMES[c1 >> 2]
+        * PRIMES[c2 >> 2]
+        * PRIMES[c3 >> 2]
+        * PRIMES[c4 >> 2]
+    )
+    return PRODUCT_RANKS[np.searchsorted(PRODUCT_KEYS, product)]
+
+
+@njit(cache=True)
+def eval7(cards: np.ndarray) -> int:
+    """Best (lowest) rank over every five-card subset of 5-7 cards"""
+    n = len(cards)
+    best = 7463
+    for a in range(n - 4):
+        for b in range(a + 1, n - 3):
+            for c in range(b + 1, n - 2):
+                for d in range(c + 1, n - 1):
+                    for e in range(d + 1, n):
+                        rank = eval5(
+                            int(cards[a]),
+                            int(cards[b]),
+                            int(cards[c]),
+                            int(cards[d]),
+                            int(cards[e]),
+                        )
+                        if rank < best:
+                            best = rank
+    return best
+
+
+def eval7_batch(hands: np.ndarray) -> np.ndarray:
+    """eval7 for every row of an (n, 5-7) card array, vectorized with NumPy
+
+    For runs without Numba, where calling eval7 once per hand would mean
+    an interpreted loop per hand.
+    """
+    hands = np.asarray(hands, dtype=np.int64)
+    ranks = hands >> 2
+    suits = hands & 3
+    best = np.full(len(hands), 7463, dtype=np.int64)
+    for combo in combinations(range(hands.shape[1]), 5):
+        combo = list(combo)
+        r = ranks[:, combo]
+        s = suits[:, combo]
+        mask = np.bitwise_or.reduce(1 << r, axis=1)
+        flush = (s == s[:, :1]).all(axis=1)
+        rank = np.where(flush, FLUSH_LOOKUP[mask], UNIQUE5_LOOKUP[mask])
+
+        # Hands with a repeated rank (no entry above) go by prime product
+        product = PRIMES[r].prod(axis=1)
+        idx = np.searchsorted(PRODUCT_KEYS, product).clip(max=len(PRODUCT_KEYS) - 1)
+        rank = np.where(rank == 0, PRODUCT_RANKS[idx], rank)
+        np.minimum(best, rank, out=best)
+    return best
+
+
+def rank_class(rank: int) -> int:
+    """Index of a rank's hand class in CLASS_THRESHOLDS (0 = straight flush)"""
+    return int(np.searchsorted(CLASS_THRESHOLDS, rank))
@@ -0,0 +1,43 @@
+"""
+Hand progression history stored as parallel arrays (structure of arrays).
+Agents walk long histories column by column instead of doing several dict
+lookups per street.
+"""
+
+from typing import Dict, List, Any
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass
+class HandHistory:
+    """Street-by-street progression of a hand, one array per field"""
+
+    streets: List[str]
+    actions: List[str]
+    pots: np.ndarray
+    bets: np.ndarray
+    boards: List[str]
+
+    def __len__(self):
+        return len(self.streets)
+
+    @classmethod
+    def from_states(cls, states: List[Dict[str, Any]]) -> "HandHistory":
+        """Build from a list of per-street state dicts"""
+        count = len(states)
+        return cls(
+            streets=[state.get("street", "unknown") for state in states],
+            actions=[state.get("action", "No action recorded") for state in states],
+            pots=np.fromiter(
+                (state.get("pot_size", 0) for state in states),
+                dtype=np.float64,
+                count=count,
+            ),
+            bets=np.fromiter(
+                (state.get("bet_to_call", 0) for state in states),
+                dtype=np.float64,
+                count=count,
+            ),
+            boards=[state.get("board", "") for state in states],
+        )
@@ -0,0 +1,136 @@
+"""
+Monte Carlo showdown simulation over integer card encodings.
+Rollouts deal the unknown board and opponent hands from the live deck and
+rank every hand with the Cactus-Kev lookup tables. With Numba installed the
+loop is compiled and spread across cores with prange; without it the
+rollouts run as NumPy batches instead.
+"""
+
+from typing import Optional
+import numpy as np
+from .hand_eval_table import eval7, eval7_batch
+
+try:
+    from numba import njit, prange  # type: ignore
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional - rollouts run as NumPy batches
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(parallel=True, cache=True)
+def simulate_showdowns(
+    n_iter: int,
+    hero: np.ndarray,
+    board: np.ndarray,
+    deck: np.ndarray,
+    n_opponents: int,
+) -> np.ndarray:
+    """Return [wins, ties, losses] for the hero over n_iter random runouts
+
+    ``deck`` holds every card that could still be dealt (not in the hero's
+    hand or on the board); opponents' hole cards are drawn from it.
+    """
+    n_known = len(board)
+    n_runout = 5 - n_known
+    n_draw = n_runout + 2 * n_opponents
+
+    wins = 0
+    ties = 0
+    losses = 0
+    for _ in prange(n_iter):
+        # Partial Fisher-Yates: only the cards this rollout needs
+        cards = deck.copy()
+        for i in range(n_draw):
+            j = np.random.randint(i, len(cards))
+            cards[i], cards[j] = cards[j], cards[i]
+
+        hand = np.empty(7, dtype=np.int64)
+        hand[0] = hero[0]
+        hand[1] = hero[1]
+        for i in range(n_known):
+            hand[2 + i] = board[i]
+        for i in range(n_runout):
+            hand[2 + n_known + i] = cards[i]
+        hero_rank = eval7(hand)
+
+        # Opponents share the board; swap their hole cards into the hand
+        best_opponent = 7463
+        for opp in range(n_opponents):
+            hand[0] = cards[n_runout + 2 * opp]
+            hand[1] = cards[n_runout + 2 * opp + 1]
+            rank = eval7(hand)
+            if rank < best_opponent:
+                best_opponent = rank
+
+        if hero_rank < best_opponent:
+            wins += 1
+        elif hero_rank == best_opponent:
+            ties += 1
+        else:
+            losses += 1
+
+    result = np.empty(3, dtype=np.int64)
+    result[0] = wins
+    result[1] = ties
+    result[2] = losses
+    return result
+
+
+def simulate_showdowns_batched(
+    n_iter: int,
+    hero: np.ndarray,
+    board: np.ndarray,
+    deck: np.ndarray,
+    n_opponents: int,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """simulate_showdowns with every rollout dealt and ranked at once"""
+    rng = np.random.default_rng() if rng is None else rng
+    n_known = len(board)
+    n_runout = 5 - n_known
+
+    # Each row is an independent shuffle of the live deck; keep what's dealt
+    order = np.argsort(rng.random((n_iter, len(deck))), axis=1)
+    drawn = deck[order[:, : n_runout + 2 * n_opponents]]
+
+    hands = np.empty((n_iter, 7), dtype=np.int64)
+    hands[:, :2] = hero
+    hands[:, 2 : 2 + n_known] = board
+    hands[:, 2 + n_known :] = drawn[:, :n_runout]
+    hero_rank = eval7_batch(hands)
+
+    # Opponents share the board; swap their hole cards into the hands
+    best_opponent = np.full(n_iter, 7463, dtype=np.int64)
+    for opp in range(n_opponents):
+        start = n_runout + 2 * opp
+        hands[:, :2] = drawn[:, start : start + 2]
+        np.minimum(best_opponent, eval7_batch(hands), out=best_opponent)
+
+    wins = np.count_nonzero(hero_rank < best_opponent)
+    ties = np.count_nonzero(hero_rank == best_opponent)
+    return np.array([wins, ties, n_iter - wins - ties], dtype=np.int64)
+
+
+def showdown_counts(
+    n_iter: int,
+    hero: np.ndarray,
+    board: np.ndarray,
+    deck: np.ndarray,
+    n_opponents: int,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """[wins, ties, losses] from the compiled kernel, or NumPy batches
+
+    ``rng`` only drives the NumPy path; the compiled kernel draws from
+    Numba's own generator.
+    """
+    if NUMBA_AVAILABLE:
+        return simulate_showdowns(n_iter, hero, board, deck, n_opponents)
+    return simulate_showdowns_batched(n_iter, hero, board, deck, n_opponents, rng)
@@ -3,11 +3,11 @@ Simplified Poker Game Engine for AG2 Poker Assistant.
 Focuses on single-hand analysis rather than full game simulation.
 """
 
-import random
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -28,22 +28,52 @@ class Action(Enum):
     ALL_IN = "all_in"
 
 
-@dataclass
+# Bitmask deck encoding: bit i of a deck mask is set while card i is undealt
+RANKS = ("2", "3", "4", "5", "6", "7", "8", "9", "T", "J", "Q", "K", "A")
+SUITS = ("h", "d", "c", "s")
+INDEX_CARD = tuple((rank, suit) for rank in RANKS for suit in SUITS)
+CARD_INDEX = {card: i for i, card in enumerate(INDEX_CARD)}
+FULL_DECK_MASK = (1 << len(INDEX_CARD)) - 1
+_DECK_BITS = np.arange(len(INDEX_CARD), dtype=np.int64)
+
+# 6-max positions in seat order, and position -> seat lookup
+_POSITIONS_6MAX = ("UTG", "MP", "CO", "BTN", "SB", "BB")
+_POS_INDEX = {position: i for i, position in enumerate(_POSITIONS_6MAX)}
+
+# Street transitions: current street -> (next street, cards dealt)
+_STREET_NEXT = {
+    Street.PREFLOP: (Street.FLOP, 3),
+    Street.FLOP: (Street.TURN, 1),
+    Street.TURN: (Street.RIVER, 1),
+}
+
+
+@dataclass(frozen=True, slots=True)
 class Card:
     """Represents a playing card"""
 
     rank: str  # '2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A'
     suit: str  # 'h', 'd', 'c', 's'
+    _s: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_s", f"{self.rank}{self.suit}")
 
     def __str__(self):
-        return f"{self.rank}{self.suit}"
+        return self._s
 
     @classmethod
     def from_string(cls, card_str: str):
         """Create card from string like 'Ah' or 'Ks'"""
         if len(card_str) != 2:
             raise ValueError(f"Invalid card string: {card_str}")
-        return cls(card_str[0], card_str[1])
+        card = CARD_BY_STR.get(card_str)
+        return card if card is not None else cls(card_str[0], card_str[1])
+
+
+# Flyweight pool: one shared Card per deck index, reused by every hand
+ALL_CARDS = tuple(Card(rank, suit) for rank, suit in INDEX_CARD)
+CARD_BY_STR = {str(card): card for card in ALL_CARDS}
 
 
 @dataclass
@@ -61,22 +91,83 @@ class Player:
         return f"{self.name} ({self.position}): {cards_str} - ${self.stack}"
 
 
+class SeatView:
+    """Write-through view of one seat in an engine's seat arrays
+
+    Reads come from the arrays and assignments go straight back to them, so
+    changes stick as they did on the engine's old Player objects.
+    """
+
+    __slots__ = ("_engine", "seat")
+
+    def __init__(self, engine: "SimplifiedPokerEngine", seat: int):
+        self._engine = engine
+        self.seat = seat
+
+    @property
+    def name(self) -> str:
+        return self._engine._player_name(self.seat)
+
+    @property
+    def position(self) -> str:
+        return _POSITIONS_6MAX[self._engine.positions[self.seat]]
+
+    @position.setter
+    def position(self, position: str):
+        self._engine.positions[self.seat] = _POS_INDEX[position.upper()]
+
+    @property
+    def stack(self) -> float:
+        return float(self._engine.stacks[self.seat])
+
+    @stack.setter
+    def stack(self, stack: float):
+        self._engine.stacks[self.seat] = stack
+
+    @property
+    def hole_cards(self) -> List[Card]:
+        return [ALL_CARDS[idx] for idx in self._engine.hole_cards[self.seat].tolist()]
+
+    @hole_cards.setter
+    def hole_cards(self, cards: List[Card]):
+        self._engine.hole_cards[self.seat] = [
+            CARD_INDEX[(card.rank, card.suit)] for card in cards
+        ]
+
+    @property
+    def is_hero(self) -> bool:
+        return bool(self._engine.is_hero[self.seat])
+
+    def __str__(self):
+        cards_str = " ".join(str(card) for card in self.hole_cards)
+        return f"{self.name} ({self.position}): {cards_str} - ${self.stack}"
+
+
 class SimplifiedPokerEngine:
     """Simplified poker engine for single-hand analysis"""
 
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
+        self._rng = np.random.default_rng(seed)
         self.reset_game()
 
         # Standard deck
-        self.ranks = ["2", "3", "4", "5", "6", "7", "8", "9", "T", "J", "Q", "K", "A"]
-        self.suits = ["h", "d", "c", "s"]
+        self.ranks = RANKS
+        self.suits = SUITS
 
         # Positions for 6-max table
-        self.positions_6max = ["UTG", "MP", "CO", "BTN", "SB", "BB"]
+        self.positions_6max = _POSITIONS_6MAX
 
     def reset_game(self):
         """Reset the game state"""
-        self.players: List[Player] = []
+        # Players are stored column-wise, one entry per seat; positions index
+        # positions_6max and hole cards are deck indices
+        self.stacks = np.zeros(0, dtype=np.float64)
+        self.positions = np.zeros(0, dtype=np.int8)
+        self.hole_cards = np.zeros((0, 2), dtype=np.int8)
+        self.is_hero = np.zeros(0, dtype=bool)
+        self.hero_idx: Optional[int] = None
+        self.sb_idx: Optional[int] = None
+        self.bb_idx: Optional[int] = None
         self.board: List[Card] = []
         self.pot = 0.0
         self.current_bet = 0.0
@@ -84,18 +175,40 @@ class SimplifiedPokerEngine:
         self.big_blind = 1.0
         self.street = Street.PREFLOP
         self.action_history: List[str] = []
+        self.deck_mask = FULL_DECK_MASK
 
     def create_deck(self) -> List[Card]:
         """Create a standard 52-card deck"""
-        return [Card(rank, suit) for rank in self.ranks for suit in self.suits]
-
-    def deal_cards(self, deck: List[Card], num_cards: int) -> List[Card]:
-        """Deal specified number of cards from deck"""
-        cards = []
-        for _ in range(num_cards):
-            if deck:
-                cards.append(deck.pop())
-        return cards
+        return list(ALL_CARDS)
+
+    def _remove_from_deck(self, cards: List[Card]):
+        """Clear the deck-mask bits of cards that are already known"""
+        for card in cards:
+            idx = CARD_INDEX.get((card.rank, card.suit))
+            if idx is not None:
+                self.deck_mask &= ~(1 << idx)
+
+    def remaining_indices(self) -> np.ndarray:
+        """Deck indices of the cards not yet dealt this hand"""
+        return np.flatnonzero((self.deck_mask >> _DECK_BITS) & 1)
+
+    def remaining_deck(self) -> List[Card]:
+        """Cards not yet dealt this hand"""
+        return [ALL_CARDS[idx] for idx in self.remaining_indices().tolist()]
+
+    def _draw_indices(self, num_cards: int) -> np.ndarray:
+        """Draw random undealt deck indices and clear their bits from the deck mask"""
+        mask = self.deck_mask
+        alive = self.remaining_indices()
+        drawn = self._rng.choice(alive, size=min(num_cards, len(alive)), replace=False)
+        for idx in drawn.tolist():
+            mask &= ~(1 << idx)
+        self.deck_mask = mask
+        return drawn
+
+    def _draw_from_deck(self, num_cards: int) -> List[Card]:
+        """Draw random undealt cards"""
+        return [ALL_CARDS[idx] for idx in self._draw_indices(num_cards).tolist()]
 
     def setup_hand(
         self,
@@ -107,162 +220,160 @@ class SimplifiedPokerEngine:
         """Setup a new poker hand"""
         self.reset_game()
 
-        # Create and shuffle deck
-        deck = self.create_deck()
-        random.shuffle(deck)
-
         # Determine positions
-        if num_opponents + 1 > len(self.positions_6max):
-            positions = self.positions_6max
+        hero_seat = _POS_INDEX.get(hero_position.upper(), -1)
+        if num_opponents + 1 > len(_POSITIONS_6MAX):
+            seats = list(range(len(_POSITIONS_6MAX)))
+        elif hero_seat < 0:
+            raise ValueError(f"Unknown hero position: {hero_position}")
         else:
             # Get subset of positions including hero_position
-            hero_idx = self.positions_6max.index(hero_position.upper())
-            positions = []
-            for i in range(num_opponents + 1):
-                pos_idx = (hero_idx - num_opponents + i) % len(self.positions_6max)
-                positions.append(self.positions_6max[pos_idx])
-
-        # Create players
-        for i, position in enumerate(positions):
-            is_hero = position == hero_position.upper()
-            player_name = "Hero" if is_hero else f"Opponent{i}"
-
-            # Deal hole cards
-            if is_hero and hero_cards != "random":
-                # Parse hero cards like "AhKs"
-                try:
-                    if len(hero_cards) == 4:
-                        card1 = Card.from_string(hero_cards[:2])
-                        card2 = Card.from_string(hero_cards[2:])
-                        hole_cards = [card1, card2]
-                        # Remove these cards from deck
-                        deck = [
-                            card
-                            for card in deck
-                            if not (
-                                (card.rank == card1.rank and card.suit == card1.suit)
-                                or (card.rank == card2.rank and card.suit == card2.suit)
-                            )
-                        ]
-                    else:
-                        hole_cards = self.deal_cards(deck, 2)
-                except (ValueError, IndexError, AttributeError):
-                    hole_cards = self.deal_cards(deck, 2)  # Fallback to random
-            else:
-                hole_cards = self.deal_cards(deck, 2)
-
-            player = Player(
-                name=player_name,
-                position=position,
-                stack=stack_size,
-                hole_cards=hole_cards,
-                is_hero=is_hero,
-            )
-            self.players.append(player)
+            seats = [
+                (hero_seat - num_opponents + i) % len(_POSITIONS_6MAX)
+                for i in range(num_opponents + 1)
+            ]
+
+        self.positions = np.array(seats, dtype=np.int8)
+        seat_of = {position: seat for seat, position in enumerate(seats)}
+        self.hero_idx = seat_of.get(hero_seat)
+        self.sb_idx = seat_of.get(_POS_INDEX["SB"])
+        self.bb_idx = seat_of.get(_POS_INDEX["BB"])
+        self.is_hero = self.positions == hero_seat
+        self.stacks = np.full(len(seats), stack_size, dtype=np.float64)
+        self.hole_cards = np.empty((len(seats), 2), dtype=np.int8)
+
+        # Parse hero cards like "AhKs" up front so they leave the deck before
+        # anyone else is dealt
+        hero_hole_cards = None
+        if hero_cards != "random":
+            try:
+                if len(hero_cards) == 4:
+                    cards = (
+                        Card.from_string(hero_cards[:2]),
+                        Card.from_string(hero_cards[2:]),
+                    )
+                    hero_hole_cards = [CARD_INDEX[(c.rank, c.suit)] for c in cards]
+                    self._remove_from_deck(cards)
+            except (ValueError, IndexError, AttributeError, KeyError):
+                hero_hole_cards = None  # Fallback to random
+
+        # Draw every random hole card in one sample
+        if hero_hole_cards is not None and self.is_hero.any():
+            self.hole_cards[self.is_hero] = hero_hole_cards
+            random_seats = ~self.is_hero
+        else:
+            random_seats = np.ones(len(seats), dtype=bool)
+        num_random = int(np.count_nonzero(random_seats))
+        self.hole_cards[random_seats] = self._draw_indices(2 * num_random).reshape(
+            num_random, 2
+        )
 
         # Post blinds
         self._post_blinds()
 
         return self.get_game_state()
 
+    def _player_name(self, seat: int) -> str:
+        return "Hero" if self.is_hero[seat] else f"Opponent{seat}"
+
     def _post_blinds(self):
         """Post small and big blinds"""
-        sb_player = None
-        bb_player = None
-
-        for player in self.players:
-            if player.position == "SB":
-                sb_player = player
-            elif player.position == "BB":
-                bb_player = player
-
-        if sb_player:
-            sb_player.stack -= self.small_blind
-            self.pot += self.small_blind
-            self.action_history.append(f"{sb_player.name} posts SB ${self.small_blind}")
-
-        if bb_player:
-            bb_player.stack -= self.big_blind
-            self.pot += self.big_blind
-            self.current_bet = self.big_blind
-            self.action_history.append(f"{bb_player.name} posts BB ${self.big_blind}")
+        for seat, position, blind in (
+            (self.sb_idx, "SB", self.small_blind),
+            (self.bb_idx, "BB", self.big_blind),
+        ):
+            if seat is None:
+                continue
+
+            self.stacks[seat] -= blind
+            self.pot += blind
+            if position == "BB":
+                self.current_bet = blind
+            self.action_history.append(
+                f"{self._player_name(seat)} posts {position} ${blind}"
+            )
 
-    def deal_flop(self):
-        """Deal the flop (3 cards)"""
-        if self.street != Street.PREFLOP:
+    def players_view(self) -> List[Player]:
+        """Build Player objects from the seat arrays (for display and formatting)"""
+        return [
+            Player(
+                name=self._player_name(seat),
+                position=_POSITIONS_6MAX[position],
+                stack=stack,
+                hole_cards=[ALL_CARDS[idx] for idx in cards],
+                is_hero=is_hero,
+            )
+            for seat, (position, stack, cards, is_hero) in enumerate(
+                zip(
+                    self.positions.tolist(),
+                    self.stacks.tolist(),
+                    self.hole_cards.tolist(),
+                    self.is_hero.tolist(),
+                )
+            )
+        ]
+
+    def _deal_street(self):
+        """Deal the cards for the street after the current one"""
+        next_street = _STREET_NEXT.get(self.street)
+        if next_street is None:
             return
 
-        deck = self.create_deck()
-        # Remove known cards
-        for player in self.players:
-            for card in player.hole_cards:
-                deck = [
-                    c for c in deck if not (c.rank == card.rank and c.suit == card.suit)
-                ]
-
-        random.shuffle(deck)
-        self.board = self.deal_cards(deck, 3)
-        self.street = Street.FLOP
-        self.current_bet = 0.0
+        street, num_cards = next_street
+        cards = self._draw_from_deck(num_cards)
+        if len(cards) == num_cards:
+            self.board.extend(cards)
+            self.street = street
+            self.current_bet = 0.0
+
+    def deal_flop(self):
+        """Deal the flop (3 cards)"""
+        if self.street == Street.PREFLOP:
+            self._deal_street()
 
     def deal_turn(self):
         """Deal the turn (4th card)"""
-        if self.street != Street.FLOP:
-            return
-
-        deck = self.create_deck()
-        # Remove known cards
-        for player in self.players:
-            for card in player.hole_cards:
-                deck = [
-                    c for c in deck if not (c.rank == card.rank and c.suit == card.suit)
-                ]
-        for card in self.board:
-            deck = [
-                c for c in deck if not (c.rank == card.rank and c.suit == card.suit)
-            ]
-
-        random.shuffle(deck)
-        new_card = self.deal_cards(deck, 1)
-        if new_card:
-            self.board.append(new_card[0])
-            self.street = Street.TURN
-            self.current_bet = 0.0
+        if self.street == Street.FLOP:
+            self._deal_street()
 
     def deal_river(self):
         """Deal the river (5th card)"""
-        if self.street != Street.TURN:
-            return
-
-        deck = self.create_deck()
-        # Remove known cards
-        for player in self.players:
-            for card in player.hole_cards:
-                deck = [
-                    c for c in deck if not (c.rank == card.rank and c.suit == card.suit)
-                ]
-        for card in self.board:
-            deck = [
-                c for c in deck if not (c.rank == card.rank and c.suit == card.suit)
-            ]
-
-        random.shuffle(deck)
-        new_card = self.deal_cards(deck, 1)
-        if new_card:
-            self.board.append(new_card[0])
-            self.street = Street.RIVER
-            self.current_bet = 0.0
+        if self.street == Street.TURN:
+            self._deal_street()
+
+    def get_hero_player(self) -> Optional[SeatView]:
+        """Get the hero player, as a write-through view of the hero's seat"""
+        if self.hero_idx is None:
+            return None
+        return SeatView(self, self.hero_idx)
+
+    def simulate_batch(
+        self, n_iter: int = 10000, scenario: Optional[str] = None
+    ) -> np.ndarray:
+        """Monte Carlo showdown counts [wins, ties, losses] for the hero's hand"""
+        # Imported here so the engine doesn't pay for the lookup tables (or a
+        # Numba import) unless it actually simulates
+        from .monte_carlo import showdown_counts
+
+        if scenario is not None:
+            self.create_scenario(scenario)
+        if self.hero_idx is None:
+            raise ValueError("No hero player found")
+
+        hero = self.hole_cards[self.hero_idx].astype(np.int64)
+        board = np.array(
+            [CARD_INDEX[(card.rank, card.suit)] for card in self.board], dtype=np.int64
+        )
+        # Opponents' hole cards are unknown to the hero, so they stay in the deck
+        deck = np.setdiff1d(_DECK_BITS, np.concatenate((hero, board)))
+        n_opponents = int(np.count_nonzero(~self.is_hero))
 
-    def get_hero_player(self) -> Optional[Player]:
-        """Get the hero player"""
-        for player in self.players:
-            if player.is_hero:
-                return player
-        return None
+        return showdown_counts(n_iter, hero, board, deck, n_opponents, self._rng)
 
     def get_game_state(self) -> Dict[str, Any]:
         """Get current game state for agent analysis"""
-        hero = self.get_hero_player()
+        players = self.players_view()
+        hero = players[self.hero_idx] if self.hero_idx is not None else None
 
         if not hero:
             return {"error": "No hero player found"}
@@ -279,7 +390,7 @@ class SimplifiedPokerEngine:
         )  # Simplified - assumes no previous action
 
         # Count opponents
-        opponents = len([p for p in self.players if not p.is_hero])
+        opponents = int(np.count_nonzero(~self.is_hero))
 
         return {
             "street": self.street.value,
@@ -292,7 +403,7 @@ class SimplifiedPokerEngine:
             "current_bet": self.current_bet,
             "opponents": opponents,
             "action_history": " | ".join(self.action_history[-3:]),  # Last 3 actions
-            "players": [str(player) for player in self.players],
+            "players": [str(player) for player in players],
         }
 
     def create_scenario(self, scenario_name: str) -> Dict[str, Any]:
@@ -342,12 +453,7 @@ class SimplifiedPokerEngine:
 
     def advance_street(self):
         """Advance to the next street"""
-        if self.street == Street.PREFLOP:
-            self.deal_flop()
-        elif self.street == Street.FLOP:
-            self.deal_turn()
-        elif self.street == Street.TURN:
-            self.deal_river()
+        self._deal_street()
 
         return self.get_game_state()
 
@@ -9,9 +9,18 @@ real-time agent discussions.
 
 import os
 import sys
-import random
-import matplotlib.pyplot as plt
-from typing import Dict, List, Any
+import asyncio
+import functools
+import io
+import itertools
+import json
+import re
+from collections import ChainMap, Counter, OrderedDict, deque
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Tuple
+import numpy as np
 
 # Fix tokenizer parallelism warnings
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -19,35 +28,187 @@ os.environ["TOKENIZERS_PARALLELISM"] = "false"
 # Add project root to path
 sys.path.append(".")
 
-# Import our modules
-from game.poker_engine import SimplifiedPokerEngine
-from visualization.table_view import PokerTableVisualizer
-from setup import KnowledgeBaseSetup
+# Import our modules - matplotlib, the knowledge base and AG2/AutoGen are
+# heavy, so they're imported where they're first needed
+from game.poker_engine import INDEX_CARD, SimplifiedPokerEngine
+from game.evaluator import cached_quick_strength, canonical_cards, parse_cards
+from game.hand_history import HandHistory
+
+
+@dataclass(frozen=True)
+class TimeoutConfig:
+    """Per-call deadlines (seconds) for agent requests"""
+
+    llm_standard: float = 30.0
+    retries: int = 1
+
+
+TIMEOUTS = TimeoutConfig()
+
+# Every card as a display string ("Ah"), built once for sampling; a card's
+# position is its deck index, so sets of cards can be 52-bit masks
+DECK = tuple(rank + suit for rank, suit in INDEX_CARD)
+_DECK_INDEX = {card: i for i, card in enumerate(DECK)}
+
+# Action words in agent messages; the leading \b skips "recall", "unfold"...
+_ACTION_RE = re.compile(r"\b(fold|raise|call)", re.IGNORECASE)
+_AMOUNT_RE = re.compile(r"\$(\d+\.?\d*)")
+
+# Everything _extract_consensus looks for, matched in one scan per message
+_CONSENSUS_RE = re.compile(
+    r"\b(?P<action>fold|raise|call)|\$(?P<amount>\d+\.?\d*)?"
+    r"|(?P<cue>consensus|recommend)",
+    re.IGNORECASE,
+)
+
+_LATE_POSITIONS = frozenset(("BTN", "CO"))
+
+# Finished hands kept for the stats command; totals come from session_outcomes
+_SESSION_HISTORY = 200
+
+# Random hand generation
+_SCENARIOS = (
+    "premium_pair",
+    "tough_decision",
+    "bluff_spot",
+    "pocket_pair",
+    "drawing_hand",
+)
+_POSITIONS = ("UTG", "MP", "CO", "BTN", "SB", "BB")
+_STREET_BY_BOARD_SIZE = {3: "flop", 4: "turn", 5: "river"}
+
+# Streets in order, and each street's place in that order
+_STREETS = ("preflop", "flop", "turn", "river")
+_STREET_INDEX = {street: i for i, street in enumerate(_STREETS)}
+_STREET_EMOJIS = {"preflop": "🃏", "flop": "🎯", "turn": "🔄", "river": "🎰"}
+
+# Random numbers behind one scenario; generate_random_hand draws a batch of
+# these at a time and deals from it
+_HAND_PARAMS = np.dtype(
+    [
+        ("scenario", np.int8),
+        ("position", np.int8),
+        ("pot", np.float64),
+        ("bet", np.float64),
+        ("opponents", np.int8),
+        ("board_size", np.int8),
+        # A random board plus two spares, in case it hits the hole cards
+        ("board_pool", np.uint8, (7,)),
+    ]
+)
+_HAND_PARAMS_BATCH = 64
+
+# Batched LLM recommendations kept for repeat preflop spots
+_RECOMMENDATION_CACHE_SIZE = 4096
+
+# Simulated opponent reply; mostly calls for simplicity
+_OPPONENT_ACTIONS = ("calls", "raises", "calls")
+
+# Footer of the agents command
+_AGENT_REQUIREMENTS = """
+
+📋 Requirements for real agents:
+   • AG2/AutoGen installed: pip install ag2
+   • Ollama running on localhost:11434
+   • llama3.2:latest model downloaded
+   • Knowledge base initialized (optional)
+"""
 
-# Try to import agents and autogen - fallback to None if not available
-try:
-    from agents import RulesAgent, PositionAgent, MathAgent, JonathanAgent
-    from autogen import GroupChat, GroupChatManager  # type: ignore
-    AGENTS_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ AG2/AutoGen not available: {e}")
-    print("📝 AG2/AutoGen not available - simulator requires real agents")
-    RulesAgent = PositionAgent = MathAgent = JonathanAgent = None
-    GroupChat = GroupChatManager = None
-    AGENTS_AVAILABLE = False
+# REPL command aliases
+_QUIT_COMMANDS = frozenset(("quit", "q", "exit"))
+_DEAL_COMMANDS = frozenset(("new", "n", "deal"))
+_HELP_COMMANDS = frozenset(("help", "h"))
+_PLAIN_ACTIONS = frozenset(("fold", "call", "check"))
+
+# REPL command -> handler method name; commands that take an argument are
+# matched by prefix, in order, when the exact lookup misses
+_COMMAND_HANDLERS = {
+    **dict.fromkeys(_QUIT_COMMANDS, "_cmd_quit"),
+    **dict.fromkeys(_DEAL_COMMANDS, "_cmd_deal"),
+    **dict.fromkeys(_HELP_COMMANDS, "_cmd_help"),
+    **dict.fromkeys(_PLAIN_ACTIONS, "_cmd_action"),
+    "stats": "_cmd_stats",
+    "agents": "_cmd_agents",
+    "reset": "_cmd_reset",
+}
+_PREFIX_HANDLERS = (
+    ("discuss ", "_cmd_discuss"),
+    ("bet", "_cmd_action"),
+    ("raise", "_cmd_action"),
+)
+
+
+def _card_mask(cards) -> int:
+    """Bitmask of the deck indices of card strings; unknown strings are skipped"""
+    mask = 0
+    for card in cards:
+        index = _DECK_INDEX.get(card)
+        if index is not None:
+            mask |= 1 << index
+    return mask
+
+
+def _cards_before_pair(cards) -> int:
+    """How many cards come before the first one that pairs an earlier rank"""
+    rank_mask = 0
+    for i, card in enumerate(cards):
+        bit = 1 << (_DECK_INDEX[card] >> 2)
+        if rank_mask & bit:
+            return i
+        rank_mask |= bit
+    return len(cards)
+
+
+def _undealt(mask: int) -> List[str]:
+    """Cards whose bits are clear in mask, in deck order"""
+    return [card for i, card in enumerate(DECK) if not mask >> i & 1]
+
+
+def _hand_class(hole_cards: str) -> str:
+    """Starting-hand class of hole cards like 'Ah Kd': 'AKo', 'AKs' or 'AA'"""
+    high, low = sorted((_DECK_INDEX[card] for card in hole_cards.split()), reverse=True)
+    ranks = DECK[high][0] + DECK[low][0]
+    if high >> 2 == low >> 2:
+        return ranks
+    return ranks + ("s" if high & 3 == low & 3 else "o")
+
+
+@lru_cache(maxsize=1)
+def _load_knowledge_base() -> Tuple[Any, Dict[str, Any]]:
+    """Build the knowledge base once per process; later simulators reuse it"""
+    from setup import KnowledgeBaseSetup
+
+    return KnowledgeBaseSetup().initialize_knowledge_base()
 
 
 class InteractivePokerSimulator:
     """Interactive poker simulation with AI agents and visualization"""
 
-    def __init__(self):
+    def __init__(self, use_groupchat: bool = False, visualize: bool = True):
         self.engine = SimplifiedPokerEngine()
-        self.visualizer = PokerTableVisualizer()
+        # With visualize off (scripted/headless runs) matplotlib is never loaded
+        self.visualize = visualize
+        self.visualizer = None  # Created on the first hand displayed
+        self._table_fig = self._table_ax = None  # One table window, redrawn per hand
         self.agents = None
+        self.llm_client = None
+        # The AG2 GroupChat layer is off by default: discussions call the
+        # agents' LLM directly and fall back to the agents' own analysis
+        self.use_groupchat = use_groupchat
         self.chat_manager = None
         self.kb = None
-        self.session_hands = []
+        self.session_hands = deque(maxlen=_SESSION_HISTORY)
+        self.session_outcomes = Counter()  # Running tally for the stats command
         self.current_hand_history = []  # Track progression within current hand
+        self._game_state = None  # Hand awaiting the player's action in the REPL
+        self._recommendation_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # Long-lived loop: asyncio.run would block on timed-out agent threads
+        # when it shuts down its executor. Created on the first agent call and
+        # released by close()
+        self._loop = None
+        self._rng = np.random.default_rng()
+        self._hand_params = np.empty(0, dtype=_HAND_PARAMS)
+        self._next_hand_params = 0
 
         # Game settings
         self.starting_stack = 100.0
@@ -67,8 +228,7 @@ class InteractivePokerSimulator:
         """Initialize the knowledge base"""
         print("🔄 Setting up knowledge base...")
         try:
-            setup_manager = KnowledgeBaseSetup()
-            self.kb, setup_info = setup_manager.initialize_knowledge_base()
+            self.kb, setup_info = _load_knowledge_base()
 
             if setup_info["success"]:
                 stats = setup_info.get("stats", {})
@@ -84,7 +244,14 @@ class InteractivePokerSimulator:
 
     def setup_agents(self):
         """Initialize AI agents with Ollama"""
-        if not AGENTS_AVAILABLE:
+        try:
+            from agents import RulesAgent, PositionAgent, MathAgent, JonathanAgent
+            from agents import TokenConsole
+            from autogen import GroupChat, GroupChatManager  # type: ignore
+            from autogen import OpenAIWrapper  # type: ignore
+            from autogen.io import IOStream  # type: ignore
+        except ImportError as e:
+            print(f"⚠️ AG2/AutoGen not available: {e}")
             print("📝 Agents not available - AG2/AutoGen setup required")
             return
             
@@ -93,7 +260,15 @@ class InteractivePokerSimulator:
             # Configure logging for better visibility of agent conversations
             import logging
             logging.basicConfig(level=logging.INFO)
-            
+
+            # Let an Ollama server started from this environment answer all
+            # four agents at once instead of queueing them on one model slot
+            os.environ.setdefault("OLLAMA_NUM_PARALLEL", "4")
+            os.environ.setdefault("OLLAMA_MAX_LOADED_MODELS", "1")
+
+            # Replies are streamed; show the tokens inline as they arrive
+            IOStream.set_global_default(TokenConsole())
+
             # Configure Ollama
             llm_config = {
                 "config_list": [
@@ -103,21 +278,31 @@ class InteractivePokerSimulator:
                         "api_key": "ollama",
                         "temperature": 0.3,
                         "price": [0, 0],
+                        "stream": True,  # Print replies token by token
                     }
                 ],
                 "timeout": 120,
             }
 
-            # Create agents (type ignore needed because of conditional import)
-            rules_agent = RulesAgent(llm_config)  # type: ignore
-            position_agent = PositionAgent(llm_config)  # type: ignore
-            math_agent = MathAgent(llm_config)  # type: ignore
-            jonathan_agent = JonathanAgent(llm_config, knowledge_base=self.kb)  # type: ignore
+            # Create agents
+            rules_agent = RulesAgent(llm_config)
+            position_agent = PositionAgent(llm_config)
+            math_agent = MathAgent(llm_config)
+            jonathan_agent = JonathanAgent(llm_config, knowledge_base=self.kb)
 
             self.agents = [rules_agent, position_agent, math_agent, jonathan_agent]
 
-            # Create GroupChat (type ignore needed because of conditional import)
-            group_chat = GroupChat(  # type: ignore
+            # One OpenAI client (and connection pool) serves every agent
+            self.llm_client = OpenAIWrapper(**llm_config)
+            for agent in self.agents:
+                agent.client = self.llm_client
+
+            if not self.use_groupchat:
+                print(f"✅ Created {len(self.agents)} AI agents")
+                return
+
+            # Create GroupChat
+            group_chat = GroupChat(
                 agents=self.agents,
                 messages=[],
                 max_round=8,  # Allow enough rounds for all agents to speak
@@ -125,9 +310,10 @@ class InteractivePokerSimulator:
                 allow_repeat_speaker=False,  # Ensure all agents get to speak first
             )
 
-            self.chat_manager = GroupChatManager(  # type: ignore
+            self.chat_manager = GroupChatManager(
                 groupchat=group_chat, llm_config=llm_config
             )
+            self.chat_manager.client = self.llm_client
 
             print(f"✅ Created {len(self.agents)} AI agents with GroupChat")
 
@@ -139,67 +325,71 @@ class InteractivePokerSimulator:
             print("   • Check if llama3.2 model is available: ollama list")
             print("   • Real agent setup required - simulator will not function without agents")
             self.agents = None
+            self.llm_client = None
             self.chat_manager = None
 
     def generate_random_hand(self) -> Dict[str, Any]:
         """Generate a random poker scenario"""
-        scenarios = [
-            "premium_pair",
-            "tough_decision",
-            "bluff_spot",
-            "pocket_pair",
-            "drawing_hand",
-        ]
-        scenario_type = random.choice(scenarios)
+        if self._next_hand_params == len(self._hand_params):
+            self._hand_params = self._draw_hand_params(_HAND_PARAMS_BATCH)
+            self._next_hand_params = 0
+        params = self._hand_params[self._next_hand_params]
+        self._next_hand_params += 1
+        return self._build_hand(params)
+
+    def generate_random_hands(self, count: int) -> List[Dict[str, Any]]:
+        """Generate several random scenarios, drawing their numbers in bulk"""
+        return [self._build_hand(params) for params in self._draw_hand_params(count)]
+
+    def _draw_hand_params(self, count: int) -> np.ndarray:
+        """Draw the random numbers for count scenarios in one go"""
+        rng = self._rng
+        params = np.empty(count, dtype=_HAND_PARAMS)
+        params["scenario"] = rng.integers(len(_SCENARIOS), size=count)
+        params["position"] = rng.integers(len(_POSITIONS), size=count)
+        params["pot"] = rng.uniform(5, 25, size=count)
+        params["bet"] = rng.uniform(0, 15, size=count)
+        params["opponents"] = rng.integers(1, 5, size=count)
+        # 40% chance of flop+, then a flop, turn or river board
+        params["board_size"] = np.where(
+            rng.random(count) > 0.6, rng.integers(3, 6, size=count), 0
+        )
+        # First seven cards of an independent shuffle per scenario
+        params["board_pool"] = np.argsort(rng.random((count, len(DECK))), axis=1)[:, :7]
+        return params
 
+    def _build_hand(self, params: np.void) -> Dict[str, Any]:
+        """Turn one row of drawn numbers into a scenario"""
         # Generate base scenario
-        game_state = self.engine.create_scenario(scenario_type)
+        game_state = self.engine.create_scenario(_SCENARIOS[params["scenario"]])
 
         # Add some randomization
-        positions = ["UTG", "MP", "CO", "BTN", "SB", "BB"]
-        game_state["position"] = random.choice(positions)
+        game_state["position"] = _POSITIONS[params["position"]]
         game_state["stack_size"] = self.current_stack
-        game_state["pot_size"] = random.uniform(5, 25)
-        game_state["bet_to_call"] = random.uniform(0, 15)
-        game_state["opponents"] = random.randint(1, 4)
-
-        # Sometimes add board cards
-        if random.random() > 0.6:  # 40% chance of flop+
-            board_cards = self.generate_board()
-            game_state["board"] = " ".join(board_cards)
-            game_state["street"] = (
-                "flop"
-                if len(board_cards) == 3
-                else "turn"
-                if len(board_cards) == 4
-                else "river"
-            )
+        game_state["pot_size"] = float(params["pot"])
+        game_state["bet_to_call"] = float(params["bet"])
+        game_state["opponents"] = int(params["opponents"])
+
+        board_size = int(params["board_size"])
+        if board_size:
+            hole = _card_mask(game_state["hole_cards"].split())
+            pool = params["board_pool"].tolist()
+            board = [DECK[i] for i in pool if not hole >> i & 1]
+            game_state["board"] = " ".join(board[:board_size])
+            game_state["street"] = _STREET_BY_BOARD_SIZE[board_size]
         else:
             game_state["street"] = "preflop"
-
         return game_state
 
+    def _sample_cards(self, cards, count: int) -> List[str]:
+        """Draw count distinct cards from a sequence of card strings"""
+        picks = self._rng.choice(len(cards), size=count, replace=False)
+        return [cards[i] for i in picks]
+
     def generate_board(self) -> List[str]:
         """Generate random board cards"""
-        suits = ["h", "d", "c", "s"]
-        ranks = ["2", "3", "4", "5", "6", "7", "8", "9", "T", "J", "Q", "K", "A"]
-
-        cards = []
-        used = set()
-
-        num_cards = random.choice([3, 4, 5])  # flop, turn, or river
-
-        for _ in range(num_cards):
-            while True:
-                rank = random.choice(ranks)
-                suit = random.choice(suits)
-                card = f"{rank}{suit}"
-                if card not in used:
-                    cards.append(card)
-                    used.add(card)
-                    break
-
-        return cards
+        num_cards = int(self._rng.integers(3, 6))  # flop, turn, or river
+        return self._sample_cards(DECK, num_cards)
 
     def generate_hand_with_progression(self) -> Dict[str, Any]:
         """Generate a poker hand with complete street-by-street progression"""
@@ -227,6 +417,8 @@ class InteractivePokerSimulator:
         # If we have a board, build the progression
         if final_state.get("board"):
             board_cards = final_state["board"].split()
+            # Board cards dealt before the first one that pairs the board
+            unpaired = _cards_before_pair(board_cards)
             
             # Preflop action
             if "9" in hole_cards:
@@ -237,13 +429,13 @@ class InteractivePokerSimulator:
             # Flop
             if len(board_cards) >= 3:
                 flop_cards = " ".join(board_cards[:3])
-                flop_state = preflop_state.copy()
-                flop_state.update({
+                # Each street layers its changes over the previous one
+                flop_state = ChainMap({
                     "street": "flop",
                     "board": flop_cards,
                     "pot_size": final_state["pot_size"] * 0.4,
                     "bet_to_call": final_state["bet_to_call"] * 0.3
-                })
+                }, preflop_state)
                 
                 # Determine flop action based on board texture
                 if "9" in flop_cards and "9" in hole_cards:
@@ -256,8 +448,7 @@ class InteractivePokerSimulator:
             # Turn
             if len(board_cards) >= 4:
                 turn_cards = " ".join(board_cards[:4])
-                turn_state = flop_state.copy() if 'flop_state' in locals() else preflop_state.copy()
-                turn_state.update({
+                turn_state = flop_state.new_child({
                     "street": "turn", 
                     "board": turn_cards,
                     "pot_size": final_state["pot_size"] * 0.7,
@@ -265,8 +456,7 @@ class InteractivePokerSimulator:
                 })
                 
                 # Check for paired board (full house potential)
-                board_ranks = [card[0] for card in board_cards[:4]]
-                if len(set(board_ranks)) < len(board_ranks):
+                if unpaired < 4:
                     turn_state["action"] = "Turn pairs the board - now have full house! Opponent bets"
                 else:
                     turn_state["action"] = "Turn card changes nothing, opponent bets again"
@@ -276,12 +466,11 @@ class InteractivePokerSimulator:
             # River (final state)
             if len(board_cards) == 5:
                 river_cards = " ".join(board_cards)
-                board_ranks = [card[0] for card in board_cards]
                 
                 # Check for full house potential
-                if "9" in hole_cards and board_ranks.count("9") >= 1:
+                if "9" in hole_cards and "9" in river_cards:
                     final_state["action"] = "River: Full house (9s full) - opponent makes large bet"
-                elif len(set(board_ranks)) < len(board_ranks):
+                elif unpaired < 5:
                     final_state["action"] = "River: Strong hand with paired board - opponent bets"
                 else:
                     final_state["action"] = "River: Opponent makes final bet"
@@ -314,42 +503,56 @@ class InteractivePokerSimulator:
         # Enhance game state with hand history for better agent context
         enhanced_game_state = game_state.copy()
         if self.current_hand_history:
-            enhanced_game_state["hand_history"] = self.current_hand_history
-
-        # Get real agent recommendations
-        recommendations = []
-        for agent in self.agents:
-            try:
-                rec = agent.get_recommendation(enhanced_game_state)
-                recommendations.append(rec)
-            except Exception as e:
-                print(f"⚠️ Error from {agent.name}: {e}")
-                # Agent error - but still include it in results for transparency
-                recommendations.append(
-                    {
-                        "agent": agent.name,
-                        "specialty": agent.specialty,
-                        "recommendation": "Unable to analyze - check connection",
-                        "confidence": 0.0,
-                        "reasoning": f"Agent error: {str(e)[:50]}...",
-                    }
-                )
+            enhanced_game_state["hand_history"] = HandHistory.from_states(
+                self.current_hand_history
+            )
 
-        return recommendations
+        # Get real agent recommendations - all agents run concurrently
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(
+            self._gather_recommendations(enhanced_game_state)
+        )
 
+    async def _arecommend(self, agent, game_state: Dict[str, Any]) -> Dict[str, Any]:
+        """One agent's recommendation, or a placeholder entry if it fails"""
+        try:
+            # A stuck call is abandoned and retried instead of hanging the REPL
+            for attempt in range(TIMEOUTS.retries + 1):
+                try:
+                    return await asyncio.wait_for(
+                        agent.aget_recommendation(game_state),
+                        timeout=TIMEOUTS.llm_standard,
+                    )
+                except asyncio.TimeoutError:
+                    if attempt == TIMEOUTS.retries:
+                        raise TimeoutError(
+                            f"no response after {TIMEOUTS.llm_standard:g}s"
+                        )
+        except Exception as e:
+            print(f"⚠️ Error from {agent.name}: {e}")
+            # Agent error - but still include it in results for transparency
+            return {
+                "agent": agent.name,
+                "specialty": agent.specialty,
+                "recommendation": "Unable to analyze - check connection",
+                "confidence": 0.0,
+                "reasoning": f"Agent error: {str(e)[:50]}...",
+            }
 
-    def get_group_discussion(self, game_state: Dict[str, Any], question: str) -> str:
-        """Get collaborative agent discussion - requires real agents"""
-        
-        # Check if agents are available
-        if not self.chat_manager or not self.agents:
-            return "❌ Real agent discussions require AG2/AutoGen setup. Use 'agents' command for setup instructions."
-        
-        if len(self.agents) == 0:
-            return "❌ No agents initialized for discussion"
+    async def _gather_recommendations(
+        self, game_state: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Fan out to all agents at once, in agent order"""
+        return list(
+            await asyncio.gather(
+                *(self._arecommend(agent, game_state) for agent in self.agents)
+            )
+        )
 
-        # Create context for multi-agent discussion with hand history
-        context = f"""
+    def _situation_context(self, game_state: Dict[str, Any]) -> str:
+        """Describe the current hand and its progression for an LLM prompt"""
+        parts = [f"""
 POKER HAND ANALYSIS REQUEST:
 
 CURRENT SITUATION:
@@ -362,27 +565,167 @@ Stack Size: ${game_state.get('stack_size', 0)}
 Bet to Call: ${game_state.get('bet_to_call', 0)}
 Opponents: {game_state.get('opponents', 1)}
 
-HAND PROGRESSION HISTORY:"""
+HAND PROGRESSION HISTORY:"""]
         
         # Add hand history if available
-        if self.current_hand_history and len(self.current_hand_history) > 1:
-            context += "\n"
-            for i, state in enumerate(self.current_hand_history[:-1], 1):  # Exclude current state
+        history = self.current_hand_history
+        if history and len(history) > 1:
+            parts.append("\n")
+            for i in range(len(history) - 1):  # Exclude current state
+                state = history[i]
                 street = state.get('street', 'unknown').upper()
                 action = state.get('action', 'No action recorded')
                 pot = state.get('pot_size', 0)
                 bet = state.get('bet_to_call', 0)
                 board = state.get('board', '')
                 
-                context += f"{i}. {street}: {action}\n"
+                parts.append(f"{i + 1}. {street}: {action}\n")
                 if board:
-                    context += f"   Board: {board} | Pot: ${pot:.1f} | Bet: ${bet:.1f}\n"
+                    parts.append(f"   Board: {board} | Pot: ${pot:.1f} | Bet: ${bet:.1f}\n")
                 else:
-                    context += f"   Pot: ${pot:.1f} | Bet: ${bet:.1f}\n"
+                    parts.append(f"   Pot: ${pot:.1f} | Bet: ${bet:.1f}\n")
         else:
-            context += " No previous streets (preflop action)\n"
+            parts.append(" No previous streets (preflop action)\n")
+        return "".join(parts)
+
+    def _batched_recommendations(
+        self, situation: str, question: str
+    ) -> List[Dict[str, Any]]:
+        """Ask for every agent's view in one LLM call; raises if unparseable"""
+        client = self.llm_client
+        perspectives = "\n".join(
+            f"{agent.name}: {agent.specialty}" for agent in self.agents
+        )
+        prompt = (
+            f"{situation}\nQUESTION: {question}\n\n"
+            "Answer from each of these expert perspectives:\n"
+            f"{perspectives}\n\n"
+            "Return only JSON mapping each expert name to an object with "
+            '"recommendation" (FOLD, CALL, or RAISE with amount), '
+            '"confidence" (0-1) and "reasoning".'
+        )
+        response = client.create(messages=[{"role": "user", "content": prompt}])
+        text = client.extract_text_or_completion_object(response)[0] or ""
+
+        views = json.loads(text[text.find("{") : text.rfind("}") + 1])
+        return [
+            {
+                "agent": agent.name,
+                "specialty": agent.specialty,
+                "recommendation": str(views[agent.name]["recommendation"]),
+                "confidence": float(views[agent.name].get("confidence", 0.5)),
+                "reasoning": str(views[agent.name].get("reasoning", "")),
+            }
+            for agent in self.agents
+        ]
+
+    def _recommendation_key(self, game_state: Dict[str, Any], question: str):
+        """Cache key for a spot's batched recommendations, or None
+
+        Only preflop spots are keyed: position, starting-hand class, pot odds
+        to the nearest tenth, opponents and the question. Once there's a
+        board or earlier streets the prompt is too specific to reuse.
+        """
+        # A preflop hand's history is just the generic preflop entry plus the
+        # current state
+        if (
+            game_state.get("street", "preflop") != "preflop"
+            or game_state.get("board")
+            or len(self.current_hand_history) > 2
+        ):
+            return None
+        pot = game_state.get("pot_size", 0)
+        bet = game_state.get("bet_to_call", 0)
+        return (
+            game_state.get("position"),
+            _hand_class(game_state["hole_cards"]),
+            round(bet / (pot + bet), 1) if bet else 0.0,
+            game_state.get("opponents", 1),
+            question,
+        )
+
+    def _cached_batched_recommendations(
+        self, game_state: Dict[str, Any], question: str
+    ) -> List[Dict[str, Any]]:
+        """_batched_recommendations, reusing the reply for a repeat preflop spot"""
+        key = self._recommendation_key(game_state, question)
+        cached = self._recommendation_cache.get(key) if key else None
+        if cached is not None:
+            self._recommendation_cache.move_to_end(key)
+            return [dict(rec) for rec in cached]
+
+        recommendations = self._batched_recommendations(
+            self._situation_context(game_state), question
+        )
+        if key:
+            self._recommendation_cache[key] = tuple(
+                dict(rec) for rec in recommendations
+            )
+            if len(self._recommendation_cache) > _RECOMMENDATION_CACHE_SIZE:
+                self._recommendation_cache.popitem(last=False)
+        return recommendations
+
+    def get_all_recommendations_batched(
+        self, game_state: Dict[str, Any], question: str = "What is the best action?"
+    ) -> List[Dict[str, Any]]:
+        """All agents' recommendations from one LLM round-trip
+
+        Falls back to asking each agent separately if the batched reply
+        can't be used.
+        """
+        if self.llm_client and self.agents:
+            try:
+                return self._cached_batched_recommendations(game_state, question)
+            except Exception as e:
+                print(f"⚠️ Batched recommendations failed: {e}")
+        return self.get_agent_recommendations(game_state)
+
+    def _format_discussion(self, recommendations: List[Dict[str, Any]]) -> str:
+        """Render one line per agent plus the consensus, like a chat transcript"""
+        conversation = [
+            f"**{rec['agent']}**: {rec['recommendation']} - {rec['reasoning']}"
+            for rec in recommendations
+        ]
+        result = "💬 MULTI-AGENT DISCUSSION:\n" + "=" * 60 + "\n"
+        result += "\n".join(conversation)
+        consensus = self._tally_votes(recommendations)
+        if consensus:
+            result += "\n" + "-" * 60 + "\n"
+            result += f"🎯 CONSENSUS RECOMMENDATION: {consensus}"
+        return result + "\n" + "=" * 60
+
+    def get_group_discussion(self, game_state: Dict[str, Any], question: str) -> str:
+        """Get collaborative agent discussion - requires real agents"""
         
-        context += f"""
+        # Check if agents are available
+        if not self.llm_client or not self.agents:
+            return "❌ Real agent discussions require AG2/AutoGen setup. Use 'agents' command for setup instructions."
+        
+        if len(self.agents) == 0:
+            return "❌ No agents initialized for discussion"
+
+        # One round-trip covers every agent. If that reply can't be parsed,
+        # fall back to the GroupChat conversation when it's enabled, or else
+        # to each agent's own analysis (no LLM calls)
+        try:
+            print("🤖 Agents are thinking...")
+            recommendations = self._cached_batched_recommendations(
+                game_state, question
+            )
+            print()
+        except Exception as e:
+            if not self.chat_manager:
+                print(
+                    f"⚠️ Single-call discussion failed, using agent analysis: {e}"
+                )
+                return self._format_discussion(
+                    self.get_agent_recommendations(game_state)
+                )
+            print(f"⚠️ Single-call discussion failed, starting GroupChat: {e}")
+        else:
+            return self._format_discussion(recommendations)
+
+        context = self._situation_context(game_state) + f"""
 QUESTION: {question}
 
 DISCUSSION INSTRUCTIONS:
@@ -411,10 +754,16 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
             
             print("🔄 Starting agent conversation (this may take 30-60 seconds)...")
             print("🔄 Agents are thinking and discussing...")
-            print("🔄 Note: AG2 conversation may not show in real-time due to buffering")
             print("🔄 Please wait for completion message...")
             sys.stdout.flush()
             
+            # Start from a clean transcript so earlier discussions aren't resent
+            # as context
+            self.chat_manager.groupchat.reset()
+            self.chat_manager.clear_history()
+            for agent in self.agents:
+                agent.clear_history()
+
             # Start group discussion using the GroupChatManager
             chat_result = self.agents[0].initiate_chat(
                 recipient=self.chat_manager,
@@ -440,14 +789,15 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
                 print("🔍 DEBUG - Processing chat history...")
                 for i, msg in enumerate(chat_result.chat_history):
                     print(f"🔍 DEBUG - Message {i}: type={type(msg)}")
-                    if hasattr(msg, 'content') and hasattr(msg, 'name'):
-                        conversation.append(f"**{msg.name}**: {msg.content}")
-                        print(f"🔍 DEBUG - Added via attr: {msg.name}: {msg.content[:50]}...")
-                    elif isinstance(msg, dict):
+                    # AG2 chat histories are lists of dicts; check that first
+                    if isinstance(msg, dict):
                         agent_name = msg.get('name', msg.get('role', 'Agent'))
                         content = msg.get('content', str(msg))
                         conversation.append(f"**{agent_name}**: {content}")
                         print(f"🔍 DEBUG - Added via dict: {agent_name}: {content[:50]}...")
+                    elif hasattr(msg, 'content') and hasattr(msg, 'name'):
+                        conversation.append(f"**{msg.name}**: {msg.content}")
+                        print(f"🔍 DEBUG - Added via attr: {msg.name}: {msg.content[:50]}...")
                     else:
                         print(f"🔍 DEBUG - Unknown message format: {str(msg)[:100]}")
                 
@@ -474,91 +824,142 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
         except Exception as e:
             return f"❌ MultiAgent discussion failed: {e}\nPlease check AG2/Ollama setup using 'agents' command."
     
+    def _tally_votes(self, recommendations: List[Dict[str, Any]]):
+        """Majority action across structured agent recommendations"""
+        votes = Counter()
+        amounts = {}
+        for rec in recommendations:
+            text = str(rec.get("recommendation", ""))
+            match = _ACTION_RE.search(text)
+            if match:
+                action = match.group(1).upper()
+                votes[action] += 1
+                amount = _AMOUNT_RE.search(text)
+                if amount:
+                    amounts.setdefault(action, amount.group(1))
+        if not votes:
+            return None
+
+        action, count = votes.most_common(1)[0]
+        if action in amounts:
+            action += f" to ${amounts[action]}"
+        return f"{action} - {count} of {len(recommendations)} agents agreed"
+
     def _extract_consensus(self, conversation):
         """Extract consensus recommendation from agent conversation"""
-        # Look for key phrases in the last few messages
-        search_text = " ".join(conversation[-3:]).lower()  # Last 3 messages
-        
+        # Collect actions, dollar amounts and agreement cues from the last
+        # few messages in a single regex pass each
+        actions = set()
+        has_dollar = has_cue = False
+        amount = None
+        for message in conversation[-3:]:
+            for match in _CONSENSUS_RE.finditer(message):
+                if match["action"]:
+                    actions.add(match["action"].lower())
+                elif match["cue"]:
+                    has_cue = True
+                else:
+                    has_dollar = True
+                    amount = match["amount"] or amount
+
         # Look for consensus/recommendation keywords
-        if "consensus" in search_text or "recommend" in search_text:
+        if has_cue:
             # Extract action words
-            if "fold" in search_text:
+            if "fold" in actions:
                 return "FOLD - Agents agreed to fold"
-            elif "raise" in search_text and "$" in search_text:
-                # Try to extract raise amount
-                import re
-                amounts = re.findall(r'\$(\d+\.?\d*)', search_text)
-                if amounts:
-                    return f"RAISE to ${amounts[-1]} - Agents agreed to raise"
+            elif "raise" in actions and has_dollar:
+                # Use the last raise amount mentioned
+                if amount:
+                    return f"RAISE to ${amount} - Agents agreed to raise"
                 else:
                     return "RAISE - Agents agreed to raise"
-            elif "call" in search_text:
+            elif "call" in actions:
                 return "CALL - Agents agreed to call"
-        
+
         # Fallback: look for any action mentioned
-        if "call" in search_text:
+        if "call" in actions:
             return "CALL - Most recent agent suggestion"
-        elif "fold" in search_text:
+        elif "fold" in actions:
             return "FOLD - Most recent agent suggestion"
-        elif "raise" in search_text:
+        elif "raise" in actions:
             return "RAISE - Most recent agent suggestion"
-            
+
         return None
 
     def display_hand(
         self, game_state: Dict[str, Any], recommendations: List[Dict[str, Any]]
     ):
         """Display the poker hand with visualization and progression history"""
-        print("\n" + "=" * 60)
-        print(f"📊 HAND #{self.hands_played + 1}")
-        print("=" * 60)
+        # Text goes to one buffer and is written in a single call
+        buf = io.StringIO()
+        out = functools.partial(print, file=buf)
+
+        out("\n" + "=" * 60)
+        out(f"📊 HAND #{self.hands_played + 1}")
+        out("=" * 60)
 
         # Show hand progression history if available
         if self.current_hand_history and len(self.current_hand_history) > 1:
-            print("📚 HAND PROGRESSION HISTORY:")
-            print("-" * 50)
-            
-            street_emojis = {"preflop": "🃏", "flop": "🎯", "turn": "🔄", "river": "🎰"}
-            
+            out("📚 HAND PROGRESSION HISTORY:")
+            out("-" * 50)
+
             for state in self.current_hand_history[:-1]:  # All except current
                 street = state.get('street', 'preflop')
-                emoji = street_emojis.get(street, "🃏")
+                emoji = _STREET_EMOJIS.get(street, "🃏")
                 action = state.get('action', f'{street.title()} action')
                 pot = state.get('pot_size', 0)
                 bet = state.get('bet_to_call', 0)
                 board = state.get('board', '')
                 
-                print(f"{emoji} {street.upper()}: {action}")
+                out(f"{emoji} {street.upper()}: {action}")
                 if board:
-                    print(f"   Board: {board} | Pot: ${pot:.1f} | Bet to Call: ${bet:.1f}")
+                    out(f"   Board: {board} | Pot: ${pot:.1f} | Bet to Call: ${bet:.1f}")
                 else:
-                    print(f"   Pot: ${pot:.1f} | Bet to Call: ${bet:.1f}")
-                print()
-            print("-" * 50)
+                    out(f"   Pot: ${pot:.1f} | Bet to Call: ${bet:.1f}")
+                out()
+            out("-" * 50)
 
         # Current game state info
-        print(f"CURRENT STREET: {game_state.get('street', 'preflop').upper()}")
-        print(f"Position: {game_state['position']}")
-        print(f"Hole Cards: {game_state['hole_cards']}")
+        out(f"CURRENT STREET: {game_state.get('street', 'preflop').upper()}")
+        out(f"Position: {game_state['position']}")
+        out(f"Hole Cards: {game_state['hole_cards']}")
         if game_state.get("board"):
-            print(f"Board: {game_state['board']}")
-        print(f"Stack: ${game_state['stack_size']}")
-        print(f"Pot: ${game_state['pot_size']}")
-        print(f"Bet to Call: ${game_state['bet_to_call']}")
-        print(f"Opponents: {game_state['opponents']}")
+            out(f"Board: {game_state['board']}")
+        out(f"Stack: ${game_state['stack_size']}")
+        out(f"Pot: ${game_state['pot_size']}")
+        out(f"Bet to Call: ${game_state['bet_to_call']}")
+        out(f"Opponents: {game_state['opponents']}")
 
         # Agent recommendations
-        print("\n🤖 AGENT RECOMMENDATIONS:")
+        out("\n🤖 AGENT RECOMMENDATIONS:")
         for i, rec in enumerate(recommendations, 1):
-            print(
+            out(
                 f"{i}. {rec['agent']}: {rec['recommendation']} ({rec['confidence']:.1%})"
             )
 
+        sys.stdout.write(buf.getvalue())
+        if not self.visualize:
+            return
+
         # Create and show visualization (GUI shows only game state, recommendations in terminal)
         try:
-            self.visualizer.visualize_game_state(game_state)
-            plt.show(block=False)  # Non-blocking show
-            plt.pause(0.1)  # Brief pause to render
+            import matplotlib.pyplot as plt
+
+            if self.visualizer is None:
+                from visualization.table_view import PokerTableVisualizer
+
+                self.visualizer = PokerTableVisualizer()
+
+            # Reopen the table window only if it was never shown or was closed
+            fig = self._table_fig
+            if fig is None or not plt.fignum_exists(fig.number):
+                plt.ion()
+                self._table_fig, self._table_ax = self.visualizer.create_figure()
+                plt.show(block=False)  # Non-blocking show
+
+            self.visualizer.visualize_game_state(game_state, ax=self._table_ax)
+            self._table_fig.canvas.draw_idle()
+            self._table_fig.canvas.flush_events()
         except Exception as e:
             print(f"⚠️ Visualization error: {e}")
 
@@ -604,10 +1005,11 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
             self.current_stack += result["amount_change"]
             result["new_stack"] = self.current_stack
 
-        # Store hand history
+        # Store hand history - the hand is over, so keep a read-only view of
+        # its state rather than a copy
         hand_result = {
             "hand_number": self.hands_played + 1,
-            "game_state": game_state.copy(),
+            "game_state": MappingProxyType(game_state),
             "action": action,
             "outcome": result["outcome"],
             "stack_change": result["amount_change"],
@@ -615,20 +1017,35 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
             "progression": result.get("hand_progression", [])
         }
         self.session_hands.append(hand_result)
+        self.session_outcomes[result["outcome"]] += 1
 
         return result
 
-    def simulate_hand_progression(self, action: str, bet_amount: float, game_state: Dict[str, Any]) -> Dict[str, Any]:
-        """Simulate complete hand from current action to river"""
+    def simulate_hand_progression(
+        self,
+        action: str,
+        bet_amount: float,
+        game_state: Dict[str, Any],
+        verbose: bool = True,
+    ) -> Dict[str, Any]:
+        """Simulate complete hand from current action to river
+
+        The play-by-play is written in one go at the end, and not at all
+        when verbose is False (e.g. for batch runs).
+        """
         progression = []
+        buf = io.StringIO()
+        out = functools.partial(print, file=buf)
         current_pot = game_state["pot_size"]
         board_cards = game_state.get("board", "").split() if game_state.get("board") else []
         street = game_state.get("street", "preflop")
         hero_cards = game_state["hole_cards"]
         position = game_state["position"]
+        opponents = game_state.get("opponents", 1)
         
-        # Calculate hand strength for outcome probability
-        hand_strength = self.evaluate_hand_strength(hero_cards, board_cards)
+        # Equity at showdown against the hand's opponents drives the outcome
+        # probability
+        hand_strength = self.monte_carlo_equity(hero_cards, board_cards, opponents)
         
         # Show initial action
         initial_action = f"📈 {street.upper()}: You {action}"
@@ -639,34 +1056,23 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
             current_pot += game_state.get("bet_to_call", 0)
         
         progression.append(initial_action)
-        print(initial_action)
+        out(initial_action)
         
         # Simulate opponent responses and remaining streets
         total_invested = bet_amount if bet_amount > 0 else game_state.get("bet_to_call", 0)
-        streets_to_play = []
-        
-        # Determine which streets to play based on current street
-        street_order = ["preflop", "flop", "turn", "river"]
-        current_index = street_order.index(street) if street in street_order else 0
-        
-        for i in range(current_index + 1, len(street_order)):
-            streets_to_play.append(street_order[i])
+
+        # Play the streets after the current one
+        streets_to_play = _STREETS[_STREET_INDEX.get(street, 0) + 1 :]
         
-        # Generate board cards for remaining streets based on current state
-        all_cards = []
+        # Deal the rest of the board in one draw from the cards not in play
+        remaining = _undealt(_card_mask(hero_cards.split() + board_cards))
         if not board_cards:  # Starting preflop
-            # Generate a progressive board (we'll add cards as streets progress)
-            all_cards = self.generate_board()  # This could be 3, 4, or 5 cards
+            # A progressive board of 3, 4, or 5 cards, revealed street by street
+            all_cards = self._sample_cards(remaining, int(self._rng.integers(3, 6)))
         else:
-            # Use existing board cards and generate additional ones if needed
-            all_cards = board_cards.copy()
-            # Add cards as needed for progression
-            needed_cards = 5 - len(all_cards)
-            if needed_cards > 0:
-                additional_cards = self.generate_board()
-                # Take only the cards we need
-                all_cards.extend(additional_cards[:needed_cards])
-        
+            needed_cards = max(5 - len(board_cards), 0)
+            all_cards = board_cards + self._sample_cards(remaining, needed_cards)
+
         # Simulate each street
         for i, next_street in enumerate(streets_to_play):
             # Update board
@@ -675,46 +1081,48 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
                 board_str = " ".join(board_cards)
                 street_msg = f"🃏 FLOP: {board_str} (pot: ${current_pot})"
                 progression.append(street_msg)
-                print(street_msg)
+                out(street_msg)
                 
             elif next_street == "turn" and len(board_cards) == 3:
                 if len(all_cards) > 3:  # Only proceed if we have a turn card
                     board_cards = all_cards[:4]
                     turn_card = all_cards[3]
-                    current_pot += random.uniform(5, 15)  # Betting action
+                    current_pot += int(self._rng.integers(5, 16))  # Betting action
                     street_msg = f"🃏 TURN: {turn_card} (pot: ${current_pot:.0f})"
                     progression.append(street_msg)
-                    print(street_msg)
+                    out(street_msg)
                 else:
                     # Skip turn if no turn card available
-                    print("⏩ Turn skipped - no turn card available")
+                    out("⏩ Turn skipped - no turn card available")
                 
             elif next_street == "river" and len(board_cards) == 4:
                 if len(all_cards) > 4:  # Only proceed if we have a river card
                     board_cards = all_cards[:5]
                     river_card = all_cards[4]
-                    current_pot += random.uniform(10, 25)  # Final betting
+                    current_pot += int(self._rng.integers(10, 26))  # Final betting
                     street_msg = f"🃏 RIVER: {river_card} (pot: ${current_pot:.0f})"
                     progression.append(street_msg)
-                    print(street_msg)
+                    out(street_msg)
                 else:
                     # Skip river if no river card available
-                    print("⏩ River skipped - no river card available")
+                    out("⏩ River skipped - no river card available")
                 
                 # Update hand strength with complete board
-                hand_strength = self.evaluate_hand_strength(hero_cards, board_cards)
+                hand_strength = self.monte_carlo_equity(
+                    hero_cards, board_cards, opponents
+                )
         
         # Simulate opponent actions throughout
-        opponent_action = random.choice(["calls", "raises", "calls"])  # Mostly calls for simplicity
+        opponent_action = _OPPONENT_ACTIONS[self._rng.integers(len(_OPPONENT_ACTIONS))]
         opp_msg = f"🤖 Opponent {opponent_action}"
         progression.append(opp_msg)
-        print(opp_msg)
+        out(opp_msg)
         
         # Determine final outcome based on hand strength and position
         win_probability = hand_strength
         
         # Adjust probability based on position and action
-        if position in ["BTN", "CO"]:
+        if position in _LATE_POSITIONS:
             win_probability += 0.1  # Position advantage
         if action.startswith("raise"):
             win_probability += 0.05  # Aggression bonus
@@ -723,22 +1131,24 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
         final_board = " ".join(all_cards[:5]) if len(all_cards) >= 5 else " ".join(board_cards)
         showdown_msg = f"🎯 SHOWDOWN: {hero_cards} vs Opponent on {final_board}"
         progression.append(showdown_msg)
-        print(showdown_msg)
+        out(showdown_msg)
         
         # Determine winner
-        if random.random() < win_probability:
+        if self._rng.random() < win_probability:
             outcome = "win"
             result_amount = current_pot - total_invested
             result_msg = f"🏆 WINNER! You win ${current_pot:.0f} pot"
         else:
             outcome = "lose" 
             result_amount = -total_invested
-            opponent_hand = self.generate_opponent_hand()
+            opponent_hand = self.generate_opponent_hand(hero_cards.split() + all_cards)
             result_msg = f"💔 LOSE: Opponent wins with {opponent_hand}"
             
         progression.append(result_msg)
-        print(f"\n{result_msg}")
-        print(f"💰 Stack Change: ${result_amount:+.0f}")
+        out(f"\n{result_msg}")
+        out(f"💰 Stack Change: ${result_amount:+.0f}")
+        if verbose:
+            sys.stdout.write(buf.getvalue())
         
         return {
             "action": action,
@@ -751,82 +1161,69 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
 
     def evaluate_hand_strength(self, hero_cards: str, board_cards: List[str]) -> float:
         """Evaluate hand strength (0.0 to 1.0) based on cards"""
-        # Simple hand strength evaluation
-        cards = hero_cards.split()
-        if not cards or len(cards) < 2:
+        hole = hero_cards.split()[:2]
+        cards = parse_cards(*hole, *board_cards) if len(hole) == 2 else None
+        if cards is None:
             return 0.5
-            
-        card1, card2 = cards[0], cards[1]
-        
-        # Extract ranks and suits
-        rank1, suit1 = card1[0], card1[1] if len(card1) > 1 else 'h'
-        rank2, suit2 = card2[0], card2[1] if len(card2) > 1 else 'h'
-        
-        # Basic hand strength
-        strength = 0.4  # Base strength
-        
-        # Premium pairs
-        if rank1 == rank2:
-            if rank1 in ['A', 'K', 'Q']:
-                strength = 0.85  # Premium pairs
-            elif rank1 in ['J', 'T', '9']:
-                strength = 0.75  # Strong pairs
-            else:
-                strength = 0.65  # Small pairs
-        
-        # High cards
-        elif rank1 in ['A', 'K'] or rank2 in ['A', 'K']:
-            strength = 0.70 if suit1 == suit2 else 0.65  # Suited/unsuited premium
-        
-        # Suited connectors and good hands
-        elif suit1 == suit2:
-            strength += 0.1  # Suited bonus
-            
-        # Adjust for board texture (simplified)
-        if board_cards:
-            # Reduce strength on dangerous boards
-            if len(set(card[1] for card in board_cards)) <= 2:  # Flush possible
-                strength *= 0.9
-            if any(abs(ord(card[0]) - ord(other[0])) <= 1 for card in board_cards for other in board_cards if card != other):  # Straight possible
-                strength *= 0.9
-                
-        return min(strength, 1.0)
+        return cached_quick_strength(canonical_cards(cards))
+
+    def monte_carlo_equity(
+        self,
+        hero_cards: str,
+        board_cards: List[str],
+        opponents: int = 1,
+        iters: int = 1000,
+    ) -> float:
+        """Hero's share of the pot (0.0 to 1.0) over random runouts and hands
+
+        Falls back to the evaluate_hand_strength heuristic if the cards can't
+        be parsed.
+        """
+        # Imported here so the lookup tables are only built once a hand is
+        # actually played out
+        from game.monte_carlo import showdown_counts
+
+        hole = hero_cards.split()[:2]
+        cards = parse_cards(*hole, *board_cards) if len(hole) == 2 else None
+        if cards is None:
+            return self.evaluate_hand_strength(hero_cards, board_cards)
+
+        cards = cards.astype(np.int64)
+        deck = np.setdiff1d(np.arange(len(DECK)), cards)
+        wins, ties, _ = showdown_counts(
+            iters, cards[:2], cards[2:], deck, opponents, self._rng
+        )
+        return (wins + ties / 2) / iters
 
-    def generate_opponent_hand(self) -> str:
-        """Generate a random opponent hand for display"""
-        hands = [
-            "Kh Qd", "Jc Ts", "9h 8s", "Ah 5d", "Qd Jh", 
-            "Tc 9c", "8d 7h", "As Kd", "Qh Qc", "Jd Jh"
-        ]
-        return random.choice(hands)
+    def generate_opponent_hand(self, dealt=()) -> str:
+        """Generate a random opponent hand for display, avoiding dealt cards"""
+        return " ".join(self._sample_cards(_undealt(_card_mask(dealt)), 2))
 
     def check_agent_status(self) -> str:
         """Check the status of agents and provide diagnostic information"""
-        status = "🔍 AGENT STATUS DIAGNOSTIC:\n"
-        status += "=" * 50 + "\n"
-        
-        if self.agents and self.chat_manager:
-            status += f"✅ Agents: {len(self.agents)} agents active\n"
-            status += "✅ ChatManager: GroupChatManager initialized\n"
-            status += "✅ MultiAgent Discussion: Available\n"
-            for i, agent in enumerate(self.agents):
-                status += f"   {i+1}. {agent.name} - Ready\n"
+        lines = ["🔍 AGENT STATUS DIAGNOSTIC:", "=" * 50]
+
+        if self.agents and (self.chat_manager or not self.use_groupchat):
+            lines.append(f"✅ Agents: {len(self.agents)} agents active")
+            if self.chat_manager:
+                lines.append("✅ ChatManager: GroupChatManager initialized")
+            else:
+                lines.append("✅ ChatManager: Off - agents are called directly")
+            lines.append("✅ MultiAgent Discussion: Available")
+            lines.extend(
+                f"   {i}. {agent.name} - Ready"
+                for i, agent in enumerate(self.agents, 1)
+            )
         elif self.agents and not self.chat_manager:
-            status += f"⚠️ Agents: {len(self.agents)} agents created\n"
-            status += "❌ ChatManager: Failed to initialize\n"
-            status += "❌ MultiAgent Discussion: Not available\n"
+            lines.append(f"⚠️ Agents: {len(self.agents)} agents created")
+            lines.append("❌ ChatManager: Failed to initialize")
+            lines.append("❌ MultiAgent Discussion: Not available")
         else:
-            status += "❌ Agents: Not initialized - AG2/AutoGen required\n"
-            status += "❌ ChatManager: Not available\n"
-            status += "❌ MultiAgent Discussion: Not available\n"
-            
-        status += "\n📋 Requirements for real agents:\n"
-        status += "   • AG2/AutoGen installed: pip install ag2\n"
-        status += "   • Ollama running on localhost:11434\n"
-        status += "   • llama3.2:latest model downloaded\n"
-        status += "   • Knowledge base initialized (optional)\n"
-        
-        return status
+            lines.append("❌ Agents: Not initialized - AG2/AutoGen required")
+            lines.append("❌ ChatManager: Not available")
+            lines.append("❌ MultiAgent Discussion: Not available")
+
+        return "\n".join(lines) + _AGENT_REQUIREMENTS
 
     def show_session_stats(self):
         """Display session statistics"""
@@ -835,12 +1232,11 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
             return
 
         total_profit = self.current_stack - self.starting_stack
-        win_rate = sum(1 for h in self.session_hands if h["outcome"] == "win") / len(
-            self.session_hands
-        )
+        hands_played = sum(self.session_outcomes.values())
+        win_rate = self.session_outcomes["win"] / hands_played
 
         print("\n📊 SESSION STATS:")
-        print(f"Hands Played: {len(self.session_hands)}")
+        print(f"Hands Played: {hands_played}")
         print(f"Starting Stack: ${self.starting_stack}")
         print(f"Current Stack: ${self.current_stack}")
         print(f"Profit/Loss: ${total_profit:+.2f}")
@@ -848,7 +1244,8 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
 
         # Show recent hands
         print("\n📝 RECENT HANDS:")
-        for hand in self.session_hands[-5:]:
+        recent = max(len(self.session_hands) - 5, 0)
+        for hand in itertools.islice(self.session_hands, recent, None):
             result_symbol = (
                 "✅"
                 if hand["outcome"] == "win"
@@ -878,6 +1275,99 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
             except:
                 pass  # Best effort only
 
+    # REPL command handlers: each takes the command line and returns True to
+    # end the session
+
+    def _cmd_quit(self, command: str) -> bool:
+        print("\n👋 Thanks for playing!")
+        self.show_session_stats()
+        return True
+
+    def _cmd_deal(self, command: str) -> bool:
+        self._game_state = self.generate_hand_with_progression()
+        try:
+            recommendations = self.get_agent_recommendations(self._game_state)
+            self.display_hand(self._game_state, recommendations)
+        except Exception as e:
+            print(f"❌ Cannot deal new hand: {e}")
+            print(
+                "💡 Setup AG2/AutoGen to enable gameplay. "
+                "Use 'agents' command for instructions."
+            )
+        return False
+
+    def _cmd_stats(self, command: str) -> bool:
+        self.show_session_stats()
+        return False
+
+    def _cmd_agents(self, command: str) -> bool:
+        print(self.check_agent_status())
+        return False
+
+    def _cmd_reset(self, command: str) -> bool:
+        self.current_stack = self.starting_stack
+        self.hands_played = 0
+        self.session_hands.clear()
+        self.session_outcomes.clear()
+        self.current_hand_history = []  # Clear hand progression
+        print("🔄 Session reset! Stack back to $100")
+        return False
+
+    def _cmd_discuss(self, command: str) -> bool:
+        if self._game_state:
+            question = command[8:]  # Remove 'discuss '
+            print(f"\n💬 AGENT DISCUSSION: {question}")
+            print("-" * 60)
+            print(self.get_group_discussion(self._game_state, question))
+        else:
+            print("❌ No active hand! Deal a new hand first with 'new'")
+        return False
+
+    def _cmd_action(self, command: str) -> bool:
+        if self._game_state:
+            result = self.process_action(command, self._game_state)
+            self.hands_played += 1
+
+            # Final summary is already shown in the hand progression
+            print("\n" + "=" * 50)
+            print(f"📊 HAND #{self.hands_played + 1} COMPLETE")
+            print(f"💰 Final Stack: ${result['new_stack']}")
+            print("=" * 50)
+
+            # Clear current hand
+            self._game_state = None
+        else:
+            print("❌ No active hand! Deal a new hand first with 'new'")
+        return False
+
+    def _cmd_help(self, command: str) -> bool:
+        print("🎯 Available commands:")
+        print("  new/n - Deal new hand")
+        print("  fold/call/check/bet X/raise X - Make action")
+        print("  discuss QUESTION - MultiAgent discussion")
+        print("  stats - Session statistics")
+        print("  agents - Agent status and diagnostics")
+        print("  reset - Reset session")
+        print("  quit/q - Exit")
+        return False
+
+    def close(self):
+        """Shut down the event loop the agent calls run on, if one was started"""
+        if self._loop is None:
+            return
+        try:
+            # Bounded, since a timed-out agent call may still hold a worker
+            self._loop.run_until_complete(
+                asyncio.wait_for(
+                    self._loop.shutdown_default_executor(), TIMEOUTS.llm_standard
+                )
+            )
+        except asyncio.TimeoutError:
+            print("⚠️ Agent calls still running at exit; not waiting for them")
+        finally:
+            self._loop.close()
+            self._loop = None
+
     def main_loop(self):
         """Main interactive loop"""
         # Reset terminal input mode to prevent character-by-character input
@@ -895,8 +1385,10 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
         print("  'quit' or 'q' - Exit simulator")
         print("=" * 60)
 
-        current_game_state = None
-        current_recommendations = None
+        # Bind the dispatch tables once; a command is one dict lookup, with
+        # the prefix table as the fallback for commands taking an argument
+        handlers = {cmd: getattr(self, name) for cmd, name in _COMMAND_HANDLERS.items()}
+        prefixed = [(prefix, getattr(self, name)) for prefix, name in _PREFIX_HANDLERS]
 
         while True:
             try:
@@ -919,83 +1411,17 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
                 if not command:
                     continue
 
-                if command in ["quit", "q", "exit"]:
-                    print("\n👋 Thanks for playing!")
-                    self.show_session_stats()
-                    break
+                handler = handlers.get(command)
+                if handler is None:
+                    handler = next(
+                        (h for prefix, h in prefixed if command.startswith(prefix)),
+                        None,
+                    )
 
-                elif command in ["new", "n", "deal"]:
-                    current_game_state = self.generate_hand_with_progression()
-                    try:
-                        current_recommendations = self.get_agent_recommendations(
-                            current_game_state
-                        )
-                        self.display_hand(current_game_state, current_recommendations)
-                    except Exception as e:
-                        print(f"❌ Cannot deal new hand: {e}")
-                        print("💡 Setup AG2/AutoGen to enable gameplay. Use 'agents' command for instructions.")
-
-                elif command == "stats":
-                    self.show_session_stats()
-
-                elif command == "agents":
-                    print(self.check_agent_status())
-
-                elif command == "reset":
-                    self.current_stack = self.starting_stack
-                    self.hands_played = 0
-                    self.session_hands = []
-                    self.current_hand_history = []  # Clear hand progression
-                    print("🔄 Session reset! Stack back to $100")
-
-                elif command.startswith("discuss "):
-                    if current_game_state:
-                        question = command[8:]  # Remove 'discuss '
-                        print(f"\n💬 AGENT DISCUSSION: {question}")
-                        print("-" * 60)
-                        discussion = self.get_group_discussion(
-                            current_game_state, question
-                        )
-                        print(discussion)
-                    else:
-                        print("❌ No active hand! Deal a new hand first with 'new'")
-
-                elif (
-                    command in ["fold", "call", "check"]
-                    or command.startswith("bet")
-                    or command.startswith("raise")
-                ):
-                    if current_game_state:
-                        result = self.process_action(command, current_game_state)
-                        self.hands_played += 1
-
-                        # Final summary is already shown in the hand progression
-                        print("\n" + "=" * 50)
-                        print(f"📊 HAND #{self.hands_played + 1} COMPLETE")
-                        print(f"💰 Final Stack: ${result['new_stack']}")
-                        print("=" * 50)
-
-                        # Clear current hand
-                        current_game_state = None
-                        current_recommendations = None
-
-                        # Close any open plots
-                        plt.close("all")
-                    else:
-                        print("❌ No active hand! Deal a new hand first with 'new'")
-
-                elif command in ["help", "h"]:
-                    print("🎯 Available commands:")
-                    print("  new/n - Deal new hand")
-                    print("  fold/call/check/bet X/raise X - Make action")
-                    print("  discuss QUESTION - MultiAgent discussion")
-                    print("  stats - Session statistics")
-                    print("  agents - Agent status and diagnostics")
-                    print("  reset - Reset session")
-                    print("  quit/q - Exit")
-
-                else:
+                if handler is None:
                     print("❓ Unknown command. Type 'help' for available commands")
+                elif handler(command):
+                    break
 
             except KeyboardInterrupt:
                 print("\n👋 Exiting simulator...")
@@ -1014,5 +1440,13 @@ IMPORTANT: Give concrete poker analysis, not meta-discussion about the format.
 
 
 if __name__ == "__main__":
-    simulator = InteractivePokerSimulator()
-    simulator.main_loop()
+    # --groupchat runs discussions as an AG2 GroupChat conversation;
+    # --no-viz skips the table window (text only)
+    simulator = InteractivePokerSimulator(
+        use_groupchat="--groupchat" in sys.argv,
+        visualize="--no-viz" not in sys.argv,
+    )
+    try:
+        simulator.main_loop()
+    finally:
+        simulator.close()
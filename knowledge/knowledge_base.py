@@ -157,22 +157,7 @@ class PokerKnowledgeBase:
             results = self.hands_collection.query(
                 query_texts=[query], n_results=n_results
             )
-
-            formatted_results = []
-            if results["documents"] and results["documents"][0]:
-                for i, doc in enumerate(results["documents"][0]):
-                    result = {
-                        "content": doc,
-                        "metadata": results["metadatas"][0][i]
-                        if results["metadatas"]
-                        else {},
-                        "distance": results["distances"][0][i]
-                        if results["distances"]
-                        else 0,
-                    }
-                    formatted_results.append(result)
-
-            return formatted_results
+            return self._format_query_results(results, 0)
 
         except Exception as e:
             logger.error(f"Error searching hands: {e}")
@@ -186,33 +171,34 @@ class PokerKnowledgeBase:
             results = self.strategies_collection.query(
                 query_texts=[query], n_results=n_results
             )
-
-            formatted_results = []
-            if results["documents"] and results["documents"][0]:
-                for i, doc in enumerate(results["documents"][0]):
-                    result = {
-                        "content": doc,
-                        "metadata": results["metadatas"][0][i]
-                        if results["metadatas"]
-                        else {},
-                        "distance": results["distances"][0][i]
-                        if results["distances"]
-                        else 0,
-                    }
-                    formatted_results.append(result)
-
-            return formatted_results
+            return self._format_query_results(results, 0)
 
         except Exception as e:
             logger.error(f"Error searching strategies: {e}")
             return []
 
-    def get_context_for_situation(
+    def _format_query_results(self, results, index: int) -> List[Dict[str, Any]]:
+        """Format the results for one query text of a ChromaDB query"""
+        formatted_results = []
+        if results["documents"] and results["documents"][index]:
+            for i, doc in enumerate(results["documents"][index]):
+                result = {
+                    "content": doc,
+                    "metadata": results["metadatas"][index][i]
+                    if results["metadatas"]
+                    else {},
+                    "distance": results["distances"][index][i]
+                    if results["distances"]
+                    else 0,
+                }
+                formatted_results.append(result)
+
+        return formatted_results
+
+    def _build_situation_query(
         self, situation: str, position: str = "", stacks: str = "", pot_odds: str = ""
     ) -> str:
-        """Get relevant context for a specific poker situation"""
-
-        # Build query from situation components
+        """Build a search query from situation components"""
         query_parts = [situation]
         if position:
             query_parts.append(f"position {position}")
@@ -221,13 +207,14 @@ class PokerKnowledgeBase:
         if pot_odds:
             query_parts.append(f"pot odds {pot_odds}")
 
-        query = " ".join(query_parts)
-
-        # Search both hands and strategies
-        hand_results = self.search_similar_hands(query, n_results=3)
-        strategy_results = self.search_strategies(query, n_results=5)
+        return " ".join(query_parts)
 
-        # Build context string
+    def _build_context(
+        self,
+        hand_results: List[Dict[str, Any]],
+        strategy_results: List[Dict[str, Any]],
+    ) -> str:
+        """Build a context string from hand and strategy search results"""
         context_parts = []
 
         if hand_results:
@@ -250,6 +237,54 @@ class PokerKnowledgeBase:
 
         return "\n".join(context_parts)
 
+    def get_context_for_situation(
+        self, situation: str, position: str = "", stacks: str = "", pot_odds: str = ""
+    ) -> str:
+        """Get relevant context for a specific poker situation"""
+        query = self._build_situation_query(situation, position, stacks, pot_odds)
+
+        # Search both hands and strategies
+        hand_results = self.search_similar_hands(query, n_results=3)
+        strategy_results = self.search_strategies(query, n_results=5)
+
+        return self._build_context(hand_results, strategy_results)
+
+    def get_contexts_for_situations(self, situations: List[Dict[str, str]]) -> List[str]:
+        """Get context for several situations with one query per collection
+
+        Each item takes the keyword arguments of get_context_for_situation.
+        """
+        if not situations:
+            return []
+
+        queries = [self._build_situation_query(**item) for item in situations]
+
+        try:
+            hand_results = self.hands_collection.query(
+                query_texts=queries, n_results=3
+            )
+        except Exception as e:
+            logger.error(f"Error searching hands: {e}")
+            hand_results = None
+
+        try:
+            strategy_results = self.strategies_collection.query(
+                query_texts=queries, n_results=5
+            )
+        except Exception as e:
+            logger.error(f"Error searching strategies: {e}")
+            strategy_results = None
+
+        return [
+            self._build_context(
+                self._format_query_results(hand_results, i) if hand_results else [],
+                self._format_query_results(strategy_results, i)
+                if strategy_results
+                else [],
+            )
+            for i in range(len(queries))
+        ]
+
     def load_and_index_from_file(self, json_file: str):
         """Load hands from JSON file and index them"""
         try:
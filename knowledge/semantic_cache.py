@@ -0,0 +1,92 @@
+"""
+Semantic cache for knowledge base lookups.
+Returns previously retrieved context for near-duplicate queries so repeated
+situations skip the vector DB round-trip.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """LRU cache of query embeddings mapped to retrieved context"""
+
+    def __init__(
+        self,
+        embedding_function: Callable[[Any], Any],
+        threshold: float = 0.15,
+        max_entries: int = 512,
+    ):
+        self.embedding_function = embedding_function
+        self.threshold = threshold  # Max cosine distance counted as a hit
+        self.max_entries = max_entries
+
+        # Normalized embeddings live in a preallocated matrix; the ordered dict
+        # maps matrix slot -> (query, context) and tracks LRU order
+        self._vectors: Optional[np.ndarray] = None
+        self._slots: "OrderedDict[int, tuple[str, str]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def embed(self, query: str) -> np.ndarray:
+        """Embed and L2-normalize a query string"""
+        return self.embed_batch([query])[0]
+
+    def embed_batch(self, queries: List[str]) -> np.ndarray:
+        """Embed and L2-normalize several query strings in one encoder call"""
+        vectors = np.asarray(self.embedding_function(queries), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+    def lookup(self, embedding: np.ndarray) -> Optional[str]:
+        """Return cached context for the nearest query within the threshold"""
+        if not self._slots or self._vectors is None:
+            self.misses += 1
+            return None
+
+        occupied = len(self._slots)
+        similarities = self._vectors[:occupied] @ embedding
+        slot = int(np.argmax(similarities))
+
+        if 1.0 - float(similarities[slot]) < self.threshold:
+            self._slots.move_to_end(slot)
+            self.hits += 1
+            return self._slots[slot][1]
+
+        self.misses += 1
+        return None
+
+    def store(self, embedding: np.ndarray, query: str, context: str):
+        """Store a query embedding and its context, evicting the LRU entry"""
+        if self._vectors is None:
+            self._vectors = np.zeros(
+                (self.max_entries, embedding.shape[0]), dtype=np.float32
+            )
+
+        if len(self._slots) < self.max_entries:
+            slot = len(self._slots)
+        else:
+            slot, _ = self._slots.popitem(last=False)
+
+        self._vectors[slot] = embedding
+        self._slots[slot] = (query, context)
+
+    def clear(self):
+        """Drop all cached entries"""
+        self._vectors = None
+        self._slots.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache hit/miss statistics"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._slots),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
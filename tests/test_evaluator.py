@@ -0,0 +1,81 @@
+"""
+Tests for the hand strength heuristic.
+"""
+
+import unittest
+
+from game.evaluator import (
+    cached_quick_strength,
+    canonical_cards,
+    parse_cards,
+    quick_strength,
+)
+
+
+def _strength(cards: str) -> float:
+    return float(quick_strength(parse_cards(cards)))
+
+
+class QuickStrengthTest(unittest.TestCase):
+    def test_preflop_base_strength(self):
+        cases = {
+            "Ah As": 0.85,
+            "9c 9d": 0.75,
+            "5h 5s": 0.65,
+            "Ah Kh": 0.70,
+            "Ah Kd": 0.65,
+            "9h 7h": 0.5,
+            "9h 7d": 0.4,
+        }
+        for cards, expected in cases.items():
+            with self.subTest(cards=cards):
+                self.assertAlmostEqual(_strength(cards), expected)
+
+    def test_hole_card_order_does_not_matter(self):
+        self.assertEqual(_strength("Kh Ah"), _strength("Ah Kh"))
+
+    def test_board_discounts(self):
+        # Rainbow, unconnected board: no discount
+        self.assertAlmostEqual(_strength("Ah Kd 2c 7s Jh"), 0.65)
+        # Two suits on the board allow a flush
+        self.assertAlmostEqual(_strength("Ah Kd 2c 7c Jh"), 0.65 * 0.9)
+        # Adjacent ranks allow a straight; both discounts stack
+        self.assertAlmostEqual(_strength("Ah Kd 2c 3c Jh"), 0.65 * 0.81)
+
+
+class CanonicalCardsTest(unittest.TestCase):
+    def test_suit_permutations_share_a_key(self):
+        self.assertEqual(
+            canonical_cards(parse_cards("Ah Kh 2c 7d")),
+            canonical_cards(parse_cards("As Ks 2d 7h")),
+        )
+
+    def test_card_order_within_hole_and_board(self):
+        self.assertEqual(
+            canonical_cards(parse_cards("Ah Kd 2c 7s Jh")),
+            canonical_cards(parse_cards("Kd Ah Jh 2c 7s")),
+        )
+
+    def test_suitedness_is_kept(self):
+        self.assertNotEqual(
+            canonical_cards(parse_cards("Ah Kh")),
+            canonical_cards(parse_cards("Ah Kd")),
+        )
+
+    def test_hole_and_board_stay_separate(self):
+        self.assertNotEqual(
+            canonical_cards(parse_cards("Ah Kd 2c 7s 9h")),
+            canonical_cards(parse_cards("2c 7s Ah Kd 9h")),
+        )
+
+    def test_cached_strength_matches_kernel(self):
+        for cards in ("Ah As", "9h 7d 2c 3c Jh", "Qs Jd Ts 9c 2h 4s"):
+            with self.subTest(cards=cards):
+                self.assertAlmostEqual(
+                    cached_quick_strength(canonical_cards(parse_cards(cards))),
+                    _strength(cards),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for the Cactus-Kev hand-rank lookup tables.
+"""
+
+import unittest
+from itertools import chain, combinations
+
+import numpy as np
+
+from game.evaluator import parse_cards
+from game.hand_eval_table import (
+    CLASS_THRESHOLDS,
+    FLUSH_LOOKUP,
+    PRODUCT_RANKS,
+    UNIQUE5_LOOKUP,
+    eval5,
+    eval7,
+    eval7_batch,
+    rank_class,
+)
+
+
+def _rank(cards: str) -> int:
+    return eval7(parse_cards(cards).astype(np.int64))
+
+
+class LookupTableTest(unittest.TestCase):
+    def test_every_hand_class_ranked_once(self):
+        ranks = np.concatenate(
+            (
+                FLUSH_LOOKUP[FLUSH_LOOKUP > 0],
+                UNIQUE5_LOOKUP[UNIQUE5_LOOKUP > 0],
+                PRODUCT_RANKS,
+            )
+        )
+        np.testing.assert_array_equal(np.sort(ranks), np.arange(1, 7463))
+
+    def test_class_sizes(self):
+        sizes = np.diff((0,) + CLASS_THRESHOLDS)
+        np.testing.assert_array_equal(
+            sizes, [10, 156, 156, 1277, 10, 858, 858, 2860, 1277]
+        )
+
+
+class Eval5Test(unittest.TestCase):
+    def test_best_and_worst_hands(self):
+        royal = parse_cards("Ah Kh Qh Jh Th").tolist()
+        seven_high = parse_cards("7h 5d 4c 3s 2h").tolist()
+        self.assertEqual(eval5(*royal), 1)
+        self.assertEqual(eval5(*seven_high), 7462)
+
+    def test_card_order_does_not_matter(self):
+        cards = parse_cards("Kd Kc 7h 7s 2c").tolist()
+        self.assertEqual(eval5(*cards), eval5(*reversed(cards)))
+
+
+class Eval7Test(unittest.TestCase):
+    def test_hand_categories(self):
+        # rank_class counts categories down from straight flush
+        cases = {
+            "5h 4h 3h 2h Ah Kc Qd": 0,  # Steel wheel
+            "9c 9d 9h 9s 2c 3d 4h": 1,
+            "Kc Kd Kh 2s 2c 7d 8h": 2,
+            "Ah 9h 7h 4h 2h Kc Qd": 3,
+            "5c 4d 3h 2s Ah Kc Qd": 4,  # Wheel straight
+            "7c 7d 7h As Kc 2d 4h": 5,
+            "Jc Jd 4h 4s Ac 2d 3h": 6,
+            "Qc Qd 9h 7s 5c 3d 2h": 7,
+            "Ac Qd 9h 7s 5c 3d 2h": 8,
+        }
+        for cards, expected in cases.items():
+            with self.subTest(cards=cards):
+                self.assertEqual(rank_class(_rank(cards)), expected)
+
+    def test_picks_best_five(self):
+        self.assertEqual(_rank("Ah Kh Qh Jh Th 2c 3d"), 1)
+
+    def test_kickers_break_ties(self):
+        self.assertLess(_rank("Ac Ad Kh 7s 5c 3d 2h"), _rank("Ac Ad Qh 7s 5c 3d 2h"))
+        self.assertEqual(_rank("Ac Ad Kh 7s 5c 3d 2h"), _rank("As Ah Kd 7c 5h 3s 2d"))
+
+
+class Eval7BatchTest(unittest.TestCase):
+    def test_matches_eval7(self):
+        rng = np.random.default_rng(0)
+        for n_cards in (5, 6, 7):
+            hands = np.argsort(rng.random((300, 52)), axis=1)[:, :n_cards]
+            with self.subTest(n_cards=n_cards):
+                np.testing.assert_array_equal(
+                    eval7_batch(hands), [eval7(hand) for hand in hands]
+                )
+
+    def test_five_card_category_frequencies(self):
+        hands = np.fromiter(
+            chain.from_iterable(combinations(range(52), 5)), dtype=np.int64
+        ).reshape(-1, 5)
+        classes = np.searchsorted(CLASS_THRESHOLDS, eval7_batch(hands))
+        np.testing.assert_array_equal(
+            np.bincount(classes),
+            [40, 624, 3744, 5108, 10200, 54912, 123552, 1098240, 1302540],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests for MathAgent's cached pot odds, breakeven and equity calculations.
+"""
+
+import unittest
+
+from agents import math_agent
+from agents.math_agent import MathAgent
+
+_LLM_CONFIG = {
+    "config_list": [
+        {
+            "model": "llama3.2:latest",
+            "api_key": "ollama",
+            "base_url": "http://localhost:11434/v1",
+        }
+    ]
+}
+
+
+class MathAgentCacheTest(unittest.TestCase):
+    def setUp(self):
+        for cached in (
+            math_agent._pot_odds,
+            math_agent._breakeven_percentage,
+            math_agent._preflop_equity,
+        ):
+            cached.cache_clear()
+        self.agent = MathAgent(_LLM_CONFIG)
+
+    def test_pot_odds(self):
+        odds = self.agent.calculate_pot_odds(100, 50)
+        self.assertAlmostEqual(odds["pot_odds_percentage"], 100 / 3)
+        self.assertEqual(odds["pot_odds_ratio"], "2.0:1")
+        self.assertEqual(odds["pot_after_call"], 150)
+        self.assertEqual(
+            self.agent.calculate_pot_odds(100, 0), {"error": "No bet to call"}
+        )
+
+    def test_inputs_quantized_to_cents(self):
+        self.agent.calculate_pot_odds(100.001, 50)
+        self.agent.calculate_pot_odds(100.004, 50)
+        info = math_agent._pot_odds.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    def test_cache_shared_across_agents(self):
+        self.agent.calculate_breakeven_percentage(30, 10)
+        MathAgent(_LLM_CONFIG).calculate_breakeven_percentage(30, 10)
+        info = math_agent._breakeven_percentage.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        self.assertEqual(self.agent.calculate_breakeven_percentage(30, 10), 25.0)
+
+    def test_preflop_equity_scaled_per_opponent(self):
+        heads_up = self.agent.estimate_hand_equity("AA")
+        three_way = self.agent.estimate_hand_equity("AA", opponents=2)
+        self.assertEqual(heads_up["equity_percentage"], 85)
+        self.assertAlmostEqual(three_way["equity_percentage"], 85 * 0.8)
+        self.assertEqual(math_agent._preflop_equity.cache_info().misses, 2)
+
+    def test_postflop_equity_is_sampled(self):
+        equity = self.agent.estimate_hand_equity("Ah Kd", "As 7c 2d")
+        self.assertAlmostEqual(equity["equity_percentage"], 89, delta=4)
+        self.assertEqual(math_agent._preflop_equity.cache_info().currsize, 0)
+
+    def test_unreadable_board(self):
+        equity = self.agent.estimate_hand_equity("Ah Kd", "As 7c 2d 3c 4d 5s")
+        self.assertEqual(equity["equity_percentage"], 35.0)
+        self.assertEqual(equity["confidence"], "low")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Tests for the Monte Carlo showdown simulator.
+"""
+
+import unittest
+
+import numpy as np
+
+from game.evaluator import parse_cards
+from game.monte_carlo import (
+    showdown_counts,
+    simulate_showdowns,
+    simulate_showdowns_batched,
+)
+from game.poker_engine import SimplifiedPokerEngine
+
+
+def _spot(hero: str, board: str = ""):
+    """Hero cards, board and live deck as int64 deck-index arrays"""
+    hero_cards = parse_cards(hero).astype(np.int64)
+    board_cards = parse_cards(board).astype(np.int64)
+    deck = np.setdiff1d(np.arange(52), np.concatenate((hero_cards, board_cards)))
+    return hero_cards, board_cards, deck
+
+
+class SimulateShowdownsTest(unittest.TestCase):
+    def test_counts_cover_every_rollout(self):
+        counts = simulate_showdowns(200, *_spot("7h 2c"), 3)
+        self.assertEqual(counts.sum(), 200)
+        self.assertTrue((counts >= 0).all())
+
+    def test_nut_hand_always_wins(self):
+        counts = simulate_showdowns(100, *_spot("Ah Kh", "Qh Jh Th 2c 3d"), 2)
+        np.testing.assert_array_equal(counts, [100, 0, 0])
+
+    def test_royal_board_always_ties(self):
+        counts = simulate_showdowns(100, *_spot("2c 3d", "Ah Kh Qh Jh Th"), 2)
+        np.testing.assert_array_equal(counts, [0, 100, 0])
+
+    def test_aces_beat_a_random_hand_most_of_the_time(self):
+        wins, ties, _ = simulate_showdowns(2000, *_spot("Ah As"), 1)
+        self.assertAlmostEqual((wins + ties / 2) / 2000, 0.85, delta=0.04)
+
+
+class SimulateShowdownsBatchedTest(unittest.TestCase):
+    def test_known_outcomes(self):
+        np.testing.assert_array_equal(
+            simulate_showdowns_batched(100, *_spot("Ah Kh", "Qh Jh Th 2c 3d"), 2),
+            [100, 0, 0],
+        )
+        np.testing.assert_array_equal(
+            simulate_showdowns_batched(100, *_spot("2c 3d", "Ah Kh Qh Jh Th"), 2),
+            [0, 100, 0],
+        )
+
+    def test_seeded_generator_is_reproducible(self):
+        spot = _spot("Qs Jd", "Ts 9c 2h")
+        first = simulate_showdowns_batched(
+            500, *spot, 2, rng=np.random.default_rng(3)
+        )
+        second = simulate_showdowns_batched(
+            500, *spot, 2, rng=np.random.default_rng(3)
+        )
+        np.testing.assert_array_equal(first, second)
+
+    def test_agrees_with_showdown_counts(self):
+        spot = _spot("Ah As")
+        batched = simulate_showdowns_batched(4000, *spot, 1)
+        counts = showdown_counts(4000, *spot, 1)
+        equity = [(wins + ties / 2) / 4000 for wins, ties, _ in (batched, counts)]
+        self.assertAlmostEqual(equity[0], equity[1], delta=0.04)
+
+
+class SimulateBatchTest(unittest.TestCase):
+    def test_scenario_counts(self):
+        engine = SimplifiedPokerEngine(seed=7)
+        counts = engine.simulate_batch(300, scenario="premium_pair")
+        self.assertEqual(counts.sum(), 300)
+        self.assertGreater(counts[0], counts[2])
+
+    def test_requires_a_hero(self):
+        with self.assertRaises(ValueError):
+            SimplifiedPokerEngine().simulate_batch(10)
+
+
+if __name__ == "__main__":
+    unittest.main()
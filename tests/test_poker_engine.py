@@ -0,0 +1,109 @@
+"""
+Tests for the simplified poker engine's deck, dealing and seats.
+"""
+
+import unittest
+
+from game.poker_engine import (
+    CARD_INDEX,
+    FULL_DECK_MASK,
+    Card,
+    SimplifiedPokerEngine,
+)
+
+
+def _dealt_indices(engine: SimplifiedPokerEngine):
+    hole = engine.hole_cards.ravel().tolist()
+    board = [CARD_INDEX[(card.rank, card.suit)] for card in engine.board]
+    return hole + board
+
+
+class DeckMaskTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = SimplifiedPokerEngine(seed=11)
+        self.engine.setup_hand("BTN", "AhKs", num_opponents=2)
+
+    def test_reset_restores_full_deck(self):
+        self.engine.reset_game()
+        self.assertEqual(self.engine.deck_mask, FULL_DECK_MASK)
+        self.assertEqual(len(self.engine.remaining_indices()), 52)
+
+    def test_hole_cards_leave_the_deck(self):
+        remaining = set(self.engine.remaining_indices().tolist())
+        self.assertEqual(len(remaining), 52 - 6)
+        self.assertFalse(remaining & set(_dealt_indices(self.engine)))
+        self.assertNotIn(CARD_INDEX[("A", "h")], remaining)
+        self.assertNotIn(CARD_INDEX[("K", "s")], remaining)
+
+    def test_streets_deal_distinct_undealt_cards(self):
+        for deal, board_size in (
+            (self.engine.deal_flop, 3),
+            (self.engine.deal_turn, 4),
+            (self.engine.deal_river, 5),
+        ):
+            deal()
+            dealt = _dealt_indices(self.engine)
+            with self.subTest(board_size=board_size):
+                self.assertEqual(len(self.engine.board), board_size)
+                self.assertEqual(len(set(dealt)), len(dealt))
+                self.assertEqual(
+                    len(self.engine.remaining_indices()), 52 - len(dealt)
+                )
+                self.assertFalse(
+                    set(self.engine.remaining_indices().tolist()) & set(dealt)
+                )
+
+    def test_streets_deal_in_order(self):
+        self.engine.deal_turn()  # No flop yet
+        self.assertEqual(self.engine.board, [])
+
+
+class SeatArraysTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = SimplifiedPokerEngine(seed=5)
+        self.engine.setup_hand("BB", "QdQc", num_opponents=5, stack_size=50.0)
+
+    def test_seats_and_hero(self):
+        engine = self.engine
+        self.assertEqual(len(engine.stacks), 6)
+        self.assertEqual(int(engine.is_hero.sum()), 1)
+        self.assertTrue(engine.is_hero[engine.hero_idx])
+        self.assertEqual(
+            engine.hole_cards[engine.hero_idx].tolist(),
+            [CARD_INDEX[("Q", "d")], CARD_INDEX[("Q", "c")]],
+        )
+
+    def test_blinds_posted_from_stacks(self):
+        engine = self.engine
+        self.assertEqual(engine.stacks[engine.sb_idx], 49.5)
+        self.assertEqual(engine.stacks[engine.bb_idx], 49.0)
+        self.assertEqual(engine.pot, 1.5)
+        self.assertEqual(engine.current_bet, 1.0)
+
+    def test_players_view_mirrors_arrays(self):
+        players = self.engine.players_view()
+        hero = players[self.engine.hero_idx]
+        self.assertEqual([p.is_hero for p in players].count(True), 1)
+        self.assertEqual((hero.name, hero.position, hero.stack), ("Hero", "BB", 49.0))
+        self.assertEqual(" ".join(map(str, hero.hole_cards)), "Qd Qc")
+
+    def test_game_state(self):
+        state = self.engine.get_game_state()
+        self.assertEqual(state["hole_cards"], "Qd Qc")
+        self.assertEqual(state["position"], "BB")
+        self.assertEqual(state["opponents"], 5)
+        self.assertEqual(len(state["players"]), 6)
+
+    def test_hero_player_writes_through(self):
+        hero = self.engine.get_hero_player()
+        hero.stack -= 10
+        hero.hole_cards = [Card.from_string("7h"), Card.from_string("2c")]
+
+        self.assertEqual(self.engine.stacks[self.engine.hero_idx], 39.0)
+        state = self.engine.get_game_state()
+        self.assertEqual(state["stack_size"], 39.0)
+        self.assertEqual(state["hole_cards"], "7h 2c")
+
+
+if __name__ == "__main__":
+    unittest.main()
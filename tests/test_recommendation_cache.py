@@ -0,0 +1,76 @@
+"""
+Tests for the simulator's cache of batched agent recommendations.
+"""
+
+import unittest
+from unittest import mock
+
+from interactive_poker_simulator import InteractivePokerSimulator
+
+
+def _simulator() -> InteractivePokerSimulator:
+    """A simulator without the knowledge base or AG2 agents"""
+    with mock.patch.object(
+        InteractivePokerSimulator, "setup_knowledge_base"
+    ), mock.patch.object(InteractivePokerSimulator, "setup_agents"):
+        return InteractivePokerSimulator(visualize=False)
+
+
+class RecommendationCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.sim = _simulator()
+        self.addCleanup(self.sim.close)
+        self.recommendations = [
+            {
+                "agent": "MathAgent",
+                "specialty": "Pot Odds and Equity",
+                "recommendation": "CALL",
+                "confidence": 0.7,
+                "reasoning": "Priced in",
+            }
+        ]
+
+    def _preflop_hand(self):
+        for _ in range(200):
+            game_state = self.sim.generate_hand_with_progression()
+            if game_state["street"] == "preflop":
+                return game_state
+        self.fail("no preflop hand dealt in 200 tries")
+
+    def test_repeat_preflop_spot_calls_llm_once(self):
+        game_state = self._preflop_hand()
+        with mock.patch.object(
+            self.sim, "_batched_recommendations", return_value=self.recommendations
+        ) as batched:
+            first = self.sim._cached_batched_recommendations(game_state, "Call?")
+            second = self.sim._cached_batched_recommendations(game_state, "Call?")
+
+        batched.assert_called_once()
+        self.assertEqual(first, second)
+
+    def test_cached_entries_are_not_shared(self):
+        game_state = self._preflop_hand()
+        with mock.patch.object(
+            self.sim, "_batched_recommendations", return_value=self.recommendations
+        ):
+            self.sim._cached_batched_recommendations(game_state, "Call?")[0][
+                "recommendation"
+            ] = "FOLD"
+            cached = self.sim._cached_batched_recommendations(game_state, "Call?")
+
+        self.assertEqual(cached[0]["recommendation"], "CALL")
+
+    def test_postflop_spot_is_not_cached(self):
+        game_state = self._preflop_hand()
+        game_state.update(street="flop", board="2c 7d Ks")
+        with mock.patch.object(
+            self.sim, "_batched_recommendations", return_value=self.recommendations
+        ) as batched:
+            self.sim._cached_batched_recommendations(game_state, "Call?")
+            self.sim._cached_batched_recommendations(game_state, "Call?")
+
+        self.assertEqual(batched.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,7 +7,7 @@ import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle, Circle
 from matplotlib.figure import Figure
 from matplotlib.axes import Axes
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -45,6 +45,11 @@ class PokerTableVisualizer:
     def create_figure(self) -> Tuple[Figure, Axes]:
         """Create a new figure for the poker table"""
         fig, ax = plt.subplots(1, 1, figsize=(self.fig_width, self.fig_height))
+        self.draw_table(ax)
+        return fig, ax
+
+    def draw_table(self, ax: Axes):
+        """Set up the table area and felt on an empty axes"""
         ax.set_xlim(0, 10)
         ax.set_ylim(0, 6)
         ax.set_aspect("equal")
@@ -61,8 +66,6 @@ class PokerTableVisualizer:
         )
         ax.add_patch(table_bg)
 
-        return fig, ax
-
     def draw_card(
         self,
         ax: Axes,
@@ -382,10 +385,20 @@ class PokerTableVisualizer:
                 color="black",
             )
 
-    def visualize_game_state(self, game_state: Dict[str, Any]) -> Figure:
-        """Create complete visualization of the game state (GUI shows only game state, no agent recommendations)"""
+    def visualize_game_state(
+        self, game_state: Dict[str, Any], ax: Optional[Axes] = None
+    ) -> Figure:
+        """Create complete visualization of the game state (GUI shows only game state, no agent recommendations)
+
+        Pass ``ax`` to redraw an existing table instead of opening a new figure.
+        """
 
-        fig, ax = self.create_figure()
+        if ax is None:
+            fig, ax = self.create_figure()
+        else:
+            ax.cla()
+            self.draw_table(ax)
+            fig = ax.figure
 
         # Title
         street = game_state.get("street", "preflop").upper()
@@ -446,7 +459,7 @@ class PokerTableVisualizer:
 
         # GUI shows only game state - agent recommendations and discussions are in terminal
 
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
 
 